@@ -2,8 +2,13 @@
 from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from models import db, User, Product, Sale
-from services import InventoryService, SalesService, UserService
+from services import InventoryService, JobService, LocationService, ReservationService, SalesService, UserService
+from jobs import start_scheduler_thread
 from config import config
+from cache import FragmentCache, catalog_version
+from routing import close_read_session, init_replicas, replica_engines, start_replica_sync
+from formats import PRODUCT_FIELDS, SALE_FIELDS, compress_response, negotiate, rows_response
+from datetime import datetime, timedelta
 import logging
 import os
 
@@ -13,9 +18,13 @@ def create_app(config_name=None):
     
     config_name = config_name or os.environ.get('FLASK_ENV', 'default')
     app.config.from_object(config[config_name])
+    app.config['SALES_ARCHIVE_DIR'] = os.path.join(app.instance_path, app.config['SALES_ARCHIVE_DIR'])
     
     # Initialize extensions
     db.init_app(app)
+    app.extensions['fragment_cache'] = FragmentCache(ttl=app.config['FRAGMENT_CACHE_TTL'])
+    init_replicas(app)
+    app.teardown_appcontext(close_read_session)
     
     login_manager = LoginManager()
     login_manager.init_app(app)
@@ -25,6 +34,10 @@ def create_app(config_name=None):
     def load_user(user_id):
         return User.query.get(int(user_id))
     
+    @app.after_request
+    def compress(response):
+        return compress_response(request, response)
+    
     # Configure logging
     logging.basicConfig(
         level=logging.INFO,
@@ -63,16 +76,37 @@ def create_app(config_name=None):
     @login_required
     def dashboard():
         """User dashboard."""
-        products = InventoryService.get_all_products()
-        low_stock = InventoryService.get_low_stock_products()
-        return render_template('dashboard.html', products=products, low_stock=low_stock)
+        page = request.args.get('page', 1, type=int)
+        per_page = app.config['DASHBOARD_PAGE_SIZE']
+        threshold = app.config['LOW_STOCK_THRESHOLD']
+        cache = app.extensions['fragment_cache']
+        version = catalog_version()
+        
+        def render_product_table():
+            pagination = InventoryService.get_products_page(page, per_page)
+            held = ReservationService.get_held_quantities([row.id for row in pagination.items])
+            return render_template('_product_table.html', rows=pagination.items, held=held,
+                                   pagination=pagination, threshold=threshold)
+        
+        product_table = cache.get_or_set(
+            ('product_table', version, page, per_page, threshold), render_product_table
+        )
+        # The low stock count and location totals aggregate every stock row,
+        # so they refresh on the cache TTL rather than after every sale
+        low_stock_count = cache.get_or_set(
+            ('low_stock_count', threshold),
+            lambda: InventoryService.count_low_stock_products(threshold)
+        )
+        locations = cache.get_or_set(('locations',), LocationService.get_location_summary)
+        return render_template('dashboard.html', product_table=product_table,
+                               low_stock_count=low_stock_count, locations=locations)
     
     @app.route('/api/products')
     @login_required
     def api_products():
         """API endpoint for products."""
-        products = InventoryService.get_all_products()
-        return jsonify([product.to_dict() for product in products])
+        rows = InventoryService.get_all_products()
+        return rows_response(negotiate(request), PRODUCT_FIELDS, rows)
     
     @app.route('/api/purchase', methods=['POST'])
     @login_required
@@ -82,16 +116,60 @@ def create_app(config_name=None):
         result = SalesService.create_sale(
             current_user.id,
             data['product_id'],
-            data['quantity']
+            data['quantity'],
+            data.get('location_id')
         )
         return jsonify(result)
     
+    @app.route('/api/reservations', methods=['GET', 'POST'])
+    @login_required
+    def api_reservations():
+        """API endpoint to list or place the current user's checkout holds."""
+        if request.method == 'GET':
+            reservations = ReservationService.get_user_reservations(current_user.id)
+            return jsonify([reservation.to_dict() for reservation in reservations])
+        
+        data = request.get_json()
+        result = ReservationService.reserve(
+            current_user.id,
+            data['product_id'],
+            data['quantity'],
+            data.get('location_id')
+        )
+        return jsonify(result)
+    
+    @app.route('/api/reservations/<int:reservation_id>/confirm', methods=['POST'])
+    @login_required
+    def api_confirm_reservation(reservation_id):
+        """API endpoint to complete a held checkout."""
+        return jsonify(ReservationService.confirm(reservation_id, current_user.id))
+    
+    @app.route('/api/reservations/<int:reservation_id>/release', methods=['POST'])
+    @login_required
+    def api_release_reservation(reservation_id):
+        """API endpoint to cancel a held checkout."""
+        return jsonify(ReservationService.release(reservation_id, current_user.id))
+    
+    @app.route('/api/locations')
+    @login_required
+    def api_locations():
+        """API endpoint for stock totals per location."""
+        return jsonify(LocationService.get_location_summary())
+    
+    @app.route('/api/products/<int:product_id>/stock')
+    @login_required
+    def api_product_stock(product_id):
+        """API endpoint for a product's stock per location."""
+        levels = LocationService.get_stock_levels(product_id)
+        return jsonify([level.to_dict() for level in levels])
+    
     @app.route('/api/sales')
     @login_required
     def api_sales():
-        """API endpoint for sales history."""
-        sales = SalesService.get_sales_by_user(current_user.id)
-        return jsonify([sale.to_dict() for sale in sales])
+        """API endpoint for sales history, optionally only the latest ``limit``."""
+        limit = request.args.get('limit', type=int)
+        rows = SalesService.get_sales_by_user(current_user.id, limit)
+        return rows_response(negotiate(request), SALE_FIELDS, rows)
     
     @app.route('/admin')
     @login_required
@@ -101,8 +179,41 @@ def create_app(config_name=None):
             flash('Access denied')
             return redirect(url_for('dashboard'))
         
-        report = SalesService.get_sales_report()
-        return render_template('admin.html', report=report)
+        # Prefer the scheduled precomputation over recomputing on every view
+        latest = JobService.get_latest_result('sales_report', app.config['REPORT_MAX_AGE'])
+        if latest:
+            report, report_as_of = latest['result'], latest['finished_at']
+        else:
+            report, report_as_of = SalesService.get_sales_summary(recent=10), None
+        return render_template('admin.html', report=report, report_as_of=report_as_of)
+    
+    @app.route('/api/admin/report')
+    @login_required
+    def api_admin_report():
+        """Admin API for the sales report data."""
+        if current_user.role != 'admin':
+            return jsonify({'success': False, 'message': 'Access denied'}), 403
+        
+        days = request.args.get('days', 30, type=int)
+        rows = SalesService.get_sales_in_range(datetime.utcnow() - timedelta(days=days))
+        report = {
+            'period_days': days,
+            'total_revenue': sum(row.total_amount for row in rows),
+            'total_transactions': len(rows)
+        }
+        return rows_response(negotiate(request), SALE_FIELDS, rows, envelope=report, key='sales')
+    
+    @app.route('/api/admin/jobs')
+    @login_required
+    def api_admin_jobs():
+        """Admin API for background job status and run history."""
+        if current_user.role != 'admin':
+            return jsonify({'success': False, 'message': 'Access denied'}), 403
+        
+        return jsonify({
+            'jobs': [job.to_dict() for job in JobService.get_jobs()],
+            'runs': [run.to_dict() for run in JobService.get_recent_runs()]
+        })
     
     @app.route('/api/admin/products', methods=['POST'])
     @login_required
@@ -121,6 +232,33 @@ def create_app(config_name=None):
         )
         return jsonify({'success': True, 'product': product.to_dict()})
     
+    @app.route('/api/admin/locations', methods=['POST'])
+    @login_required
+    def api_admin_add_location():
+        """Admin API to add a stock location."""
+        if current_user.role != 'admin':
+            return jsonify({'success': False, 'message': 'Access denied'}), 403
+        
+        data = request.get_json()
+        location = LocationService.create_location(data['name'])
+        return jsonify({'success': True, 'location': location.to_dict()})
+    
+    @app.route('/api/admin/transfer', methods=['POST'])
+    @login_required
+    def api_admin_transfer():
+        """Admin API to move stock between locations."""
+        if current_user.role != 'admin':
+            return jsonify({'success': False, 'message': 'Access denied'}), 403
+        
+        data = request.get_json()
+        result = LocationService.transfer_stock(
+            data['product_id'],
+            data['from_location_id'],
+            data['to_location_id'],
+            data['quantity']
+        )
+        return jsonify(result)
+    
     # Create tables
     with app.app_context():
         db.create_all()
@@ -153,13 +291,22 @@ def create_app(config_name=None):
                 product = Product(
                     name=name,
                     price=price,
-                    quantity=qty,
+                    stored_quantity=qty,
                     description=desc,
                     category=cat
                 )
                 db.session.add(product)
             
             db.session.commit()
+        
+        # Products created before per-location stock start at the default location
+        LocationService.backfill_stock_levels()
+        
+        if replica_engines() and app.config['REPLICA_SYNC_INTERVAL'] > 0:
+            start_replica_sync(app, app.config['REPLICA_SYNC_INTERVAL'])
+    
+    if app.config['SCHEDULER_IN_PROCESS']:
+        start_scheduler_thread(app)
     
     return app
 
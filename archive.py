@@ -0,0 +1,265 @@
+"""Compressed cold storage for archived sales.
+
+Sales are stored in one file per month. Each file holds a small JSON
+header followed by one zlib-compressed block per column, so readers
+memory-map the file and only decompress the columns they need.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+MAGIC = b'IMSA1\n'
+HEADER_LENGTH = struct.Struct('<I')
+EPOCH = datetime(1970, 1, 1)
+
+# Column name -> array typecode, or 'str' for text columns
+COLUMNS = {
+    'id': 'q',
+    'user_id': 'q',
+    'product_id': 'q',
+    'quantity': 'q',
+    'unit_price': 'd',
+    'total_amount': 'd',
+    'sale_date': 'q',
+    'user': 'str',
+    'product': 'str',
+}
+
+def _to_micros(value: datetime) -> int:
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+def _from_micros(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=value)
+
+@contextmanager
+def _open_partition(path: str):
+    """Memory-map a partition and yield it with its header and data offset."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'Not a sales archive partition: {path}')
+
+        start = len(MAGIC) + HEADER_LENGTH.size
+        (length,) = HEADER_LENGTH.unpack(mm[len(MAGIC):start])
+        header = json.loads(mm[start:start + length].decode('utf-8'))
+        yield mm, header, start + length
+
+class ArchivedSale:
+    """Read-only sale record loaded from the archive."""
+    __slots__ = ('id', 'user_id', 'product_id', 'quantity', 'unit_price',
+                 'total_amount', 'sale_date', 'user', 'product')
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
+
+    def to_dict(self) -> dict:
+        """Convert sale to dictionary, matching ``Sale.to_dict``."""
+        return {
+            'id': self.id,
+            'user': self.user,
+            'product': self.product,
+            'quantity': self.quantity,
+            'unit_price': self.unit_price,
+            'total_amount': self.total_amount,
+            'sale_date': self.sale_date.isoformat()
+        }
+
+class SalesArchive:
+    """Month-partitioned columnar archive of sales on local disk."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @staticmethod
+    def partition_key(sale_date: datetime) -> str:
+        """Get the partition a sale belongs to."""
+        return sale_date.strftime('%Y-%m')
+
+    def partition_path(self, key: str) -> str:
+        return os.path.join(self.directory, f'sales-{key}.imsa')
+
+    def partitions(self, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> List[str]:
+        """List partition keys overlapping ``[start, end)``, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+
+        keys = sorted(
+            name[len('sales-'):-len('.imsa')]
+            for name in os.listdir(self.directory)
+            if name.startswith('sales-') and name.endswith('.imsa')
+        )
+        if start is not None:
+            keys = [key for key in keys if key >= self.partition_key(start)]
+        if end is not None:
+            keys = [key for key in keys if key <= self.partition_key(end)]
+        return keys
+
+    def write_partition(self, key: str, sales: Iterable[ArchivedSale]) -> int:
+        """Merge sales into a partition, replacing rows with the same id.
+
+        The file is rewritten to a temporary path and atomically renamed,
+        so readers never see a partial partition.
+        """
+        rows = {sale.id: sale for sale in self._read_rows(self.partition_path(key))}
+        rows.update((sale.id, sale) for sale in sales)
+        rows = sorted(rows.values(), key=lambda sale: (sale.sale_date, sale.id))
+
+        blocks = []
+        header = {'rows': len(rows), 'columns': {}}
+        if rows:
+            header['min_date'] = rows[0].sale_date.isoformat()
+            header['max_date'] = rows[-1].sale_date.isoformat()
+
+        offset = 0
+        for name, typecode in COLUMNS.items():
+            if name == 'sale_date':
+                values = [_to_micros(sale.sale_date) for sale in rows]
+            else:
+                values = [getattr(sale, name) for sale in rows]
+
+            if typecode == 'str':
+                raw = json.dumps(values).encode('utf-8')
+            else:
+                column = array(typecode, values)
+                if sys.byteorder != 'little':
+                    column.byteswap()
+                raw = column.tobytes()
+
+            block = zlib.compress(raw, 6)
+            header['columns'][name] = {
+                'offset': offset,
+                'length': len(block),
+                'crc': zlib.crc32(block),
+            }
+            blocks.append(block)
+            offset += len(block)
+
+        header_bytes = json.dumps(header).encode('utf-8')
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.partition_path(key)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(HEADER_LENGTH.pack(len(header_bytes)))
+            f.write(header_bytes)
+            for block in blocks:
+                f.write(block)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return len(rows)
+
+    def read(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+             user_id: Optional[int] = None) -> List[ArchivedSale]:
+        """Read archived sales in ``[start, end)``, optionally for one user."""
+        sales = []
+        for key in self.partitions(start, end):
+            sales.extend(self._read_rows(self.partition_path(key), start, end, user_id))
+        return sales
+
+    def totals(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+               exclude_ids: Optional[Set[int]] = None) -> Tuple[int, float]:
+        """Count and sum archived sales in ``[start, end)``.
+
+        Reads the date and amount columns only, plus the id column when
+        ``exclude_ids`` is given.
+        """
+        low = _to_micros(start) if start is not None else None
+        high = _to_micros(end) if end is not None else None
+        count, revenue = 0, 0.0
+        for key in self.partitions(start, end):
+            with _open_partition(self.partition_path(key)) as (mm, header, base):
+                if not header['rows']:
+                    continue
+                dates = self._column(mm, header, base, 'sale_date')
+                amounts = self._column(mm, header, base, 'total_amount')
+                ids = self._column(mm, header, base, 'id') if exclude_ids else None
+            for i, (value, amount) in enumerate(zip(dates, amounts)):
+                if ids is not None and ids[i] in exclude_ids:
+                    continue
+                if (low is None or value >= low) and (high is None or value < high):
+                    count += 1
+                    revenue += amount
+        return count, revenue
+
+    def newest_date(self) -> Optional[datetime]:
+        """Get the date of the newest archived sale, from partition headers only."""
+        for key in reversed(self.partitions()):
+            with _open_partition(self.partition_path(key)) as (mm, header, base):
+                if header['rows']:
+                    return datetime.fromisoformat(header['max_date'])
+        return None
+
+    def ids(self, key: str) -> Set[int]:
+        """Get the sale ids stored in a partition."""
+        path = self.partition_path(key)
+        if not os.path.exists(path):
+            return set()
+        with _open_partition(path) as (mm, header, base):
+            return set(self._column(mm, header, base, 'id'))
+
+    def verify(self, key: str) -> bool:
+        """Check a partition's column checksums and row counts."""
+        with _open_partition(self.partition_path(key)) as (mm, header, base):
+            for name, meta in header['columns'].items():
+                block = mm[base + meta['offset']:base + meta['offset'] + meta['length']]
+                if zlib.crc32(block) != meta['crc']:
+                    return False
+                if len(self._column(mm, header, base, name)) != header['rows']:
+                    return False
+        return True
+
+    def _read_rows(self, path: str, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None,
+                   user_id: Optional[int] = None) -> List[ArchivedSale]:
+        if not os.path.exists(path):
+            return []
+
+        with _open_partition(path) as (mm, header, base):
+            if not header['rows']:
+                return []
+
+            # Filter on the narrow columns first and only decode the rest for matches
+            dates = self._column(mm, header, base, 'sale_date')
+            low = _to_micros(start) if start is not None else None
+            high = _to_micros(end) if end is not None else None
+            matches = [
+                i for i, value in enumerate(dates)
+                if (low is None or value >= low) and (high is None or value < high)
+            ]
+            if user_id is not None and matches:
+                user_ids = self._column(mm, header, base, 'user_id')
+                matches = [i for i in matches if user_ids[i] == user_id]
+            if not matches:
+                return []
+
+            columns = {name: self._column(mm, header, base, name)
+                       for name in COLUMNS if name != 'sale_date'}
+
+        sales = []
+        for i in matches:
+            fields = {name: values[i] for name, values in columns.items()}
+            fields['sale_date'] = _from_micros(dates[i])
+            sales.append(ArchivedSale(**fields))
+        return sales
+
+    @staticmethod
+    def _column(mm: mmap.mmap, header: Dict, base: int, name: str):
+        meta = header['columns'][name]
+        raw = zlib.decompress(mm[base + meta['offset']:base + meta['offset'] + meta['length']])
+        if COLUMNS[name] == 'str':
+            return json.loads(raw.decode('utf-8'))
+
+        column = array(COLUMNS[name])
+        column.frombytes(raw)
+        if sys.byteorder != 'little':
+            column.byteswap()
+        return column
@@ -0,0 +1,136 @@
+"""Async (ASGI) read API for the Inventory Management System.
+
+Runs side by side with the Flask app, sharing its models, database and
+login session cookie, so polling clients don't tie up Flask workers.
+"""
+from typing import Optional
+from contextlib import asynccontextmanager
+from flask import Flask
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from models import db, User
+from services import AsyncInventoryService, AsyncSalesService
+from archive import SalesArchive
+from app import create_app
+import logging
+
+logger = logging.getLogger(__name__)
+
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+def async_database_uri(uri: str) -> str:
+    """Swap the sync driver in a database URI for its asyncio counterpart."""
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f'No async driver configured for database backend: {backend}')
+    url = url.set(drivername=ASYNC_DRIVERS[backend])
+    return url.render_as_string(hide_password=False)
+
+def create_asgi_app(config_name: Optional[str] = None, flask_app: Optional[Flask] = None) -> Starlette:
+    """Build the ASGI read API on top of a Flask app's configuration."""
+    flask_app = flask_app or create_app(config_name)
+
+    uri = flask_app.config.get('ASYNC_DATABASE_URL')
+    if not uri:
+        # Use the engine URL so relative SQLite paths resolve like in Flask
+        with flask_app.app_context():
+            uri = async_database_uri(db.engine.url.render_as_string(hide_password=False))
+
+    engine = create_async_engine(uri)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    archive = SalesArchive(flask_app.config['SALES_ARCHIVE_DIR'])
+
+    # Same signing as Flask's session cookie, so a web login works here too
+    serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+    cookie_name = flask_app.config['SESSION_COOKIE_NAME']
+    max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+
+    async def load_user(request: Request, session: AsyncSession) -> Optional[User]:
+        """Resolve the flask_login user from the session cookie."""
+        cookie = request.cookies.get(cookie_name)
+        if not cookie or serializer is None:
+            return None
+        try:
+            data = serializer.loads(cookie, max_age=max_age)
+        except Exception:
+            return None
+
+        user_id = data.get('_user_id')
+        if user_id is None:
+            return None
+        return await session.get(User, int(user_id))
+
+    def unauthorized() -> JSONResponse:
+        return JSONResponse({'success': False, 'message': 'Authentication required'}, status_code=401)
+
+    async def api_products(request: Request) -> JSONResponse:
+        """API endpoint for products."""
+        async with Session() as session:
+            if not await load_user(request, session):
+                return unauthorized()
+            products = await AsyncInventoryService.get_all_products(session)
+            return JSONResponse([product.to_dict() for product in products])
+
+    async def api_products_search(request: Request) -> JSONResponse:
+        """API endpoint for product search."""
+        query = request.query_params.get('q', '')
+        async with Session() as session:
+            if not await load_user(request, session):
+                return unauthorized()
+            products = await AsyncInventoryService.search_products(session, query)
+            return JSONResponse([product.to_dict() for product in products])
+
+    async def api_sales(request: Request) -> JSONResponse:
+        """API endpoint for sales history, optionally only the latest ``limit``."""
+        try:
+            limit = int(request.query_params['limit']) if 'limit' in request.query_params else None
+        except ValueError:
+            return JSONResponse({'success': False, 'message': 'Invalid limit'}, status_code=400)
+
+        async with Session() as session:
+            user = await load_user(request, session)
+            if not user:
+                return unauthorized()
+            sales = await AsyncSalesService.get_sales_by_user(session, user.id, archive, limit)
+            return JSONResponse([sale.to_dict() for sale in sales])
+
+    async def api_admin_report(request: Request) -> JSONResponse:
+        """Admin API for the sales report."""
+        try:
+            days = int(request.query_params.get('days', 30))
+        except ValueError:
+            return JSONResponse({'success': False, 'message': 'Invalid days'}, status_code=400)
+
+        async with Session() as session:
+            user = await load_user(request, session)
+            if not user:
+                return unauthorized()
+            if user.role != 'admin':
+                return JSONResponse({'success': False, 'message': 'Access denied'}, status_code=403)
+            report = await AsyncSalesService.get_sales_report(session, days, archive)
+            return JSONResponse(report)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        logger.info(f"Async read API using {engine.url.render_as_string()}")
+        yield
+        await engine.dispose()
+
+    return Starlette(
+        routes=[
+            Route('/api/products', api_products),
+            Route('/api/products/search', api_products_search),
+            Route('/api/sales', api_sales),
+            Route('/api/admin/report', api_admin_report),
+        ],
+        lifespan=lifespan,
+    )
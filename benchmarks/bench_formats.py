@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Benchmark bulk API serialization: ORM ``to_dict`` + jsonify vs row tuples.
+
+Usage: python benchmarks/bench_formats.py [--products N] [--sales N]
+"""
+import argparse
+import gzip
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import jsonify
+from app import create_app
+from models import db, Product, Sale
+from services import InventoryService, LocationService, SalesService
+from formats import PRODUCT_FIELDS, SALE_FIELDS, rows_response
+
+def timed(fn, repeat):
+    """Return (best seconds per call, last result)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def report(name, seconds, body):
+    print(f"{name:<28} {seconds * 1000:>9.1f} ms {len(body):>12,} B {len(gzip.compress(body)):>12,} B gz")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--products', type=int, default=20000)
+    parser.add_argument('--sales', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    with app.test_request_context():
+        db.session.bulk_insert_mappings(Product, [
+            {'name': f'Product {i}', 'price': 1.5 + i % 100, 'stored_quantity': i % 500,
+             'description': f'Description for product {i}', 'category': f'Category {i % 20}'}
+            for i in range(args.products)
+        ])
+        db.session.bulk_insert_mappings(Sale, [
+            {'user_id': 1, 'product_id': 1 + i % args.products, 'quantity': 1 + i % 5,
+             'unit_price': 2.0, 'total_amount': 2.0 * (1 + i % 5), 'sale_date': datetime.utcnow()}
+            for i in range(args.sales)
+        ])
+        db.session.commit()
+        LocationService.backfill_stock_levels()
+
+        print(f"{'path':<28} {'time':>12} {'size':>14} {'gzip size':>15}")
+        for label, fields, orm_load, row_load in [
+            ('products', PRODUCT_FIELDS, Product.query.all, InventoryService.get_all_products),
+            ('sales', SALE_FIELDS, Sale.query.filter_by(user_id=1).all,
+             lambda: SalesService.get_sales_by_user(1)),
+        ]:
+            seconds, response = timed(lambda: jsonify([obj.to_dict() for obj in orm_load()]), args.repeat)
+            report(f'{label}: ORM + jsonify', seconds, response.get_data())
+            for fmt in ('json', 'columnar', 'msgpack'):
+                seconds, response = timed(lambda: rows_response(fmt, fields, row_load()), args.repeat)
+                report(f'{label}: rows {fmt}', seconds, response.get_data())
+            db.session.expunge_all()
+
+if __name__ == '__main__':
+    main()
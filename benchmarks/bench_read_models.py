@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark read paths: ORM instances vs read-model records.
+
+Measures load time and peak traced memory for the listings behind the
+API, dashboard and CLI.
+
+Usage: python benchmarks/bench_read_models.py [--products N] [--sales N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from models import db, Product, Sale
+from services import InventoryService, LocationService, SalesService
+
+def measure(fn, repeat):
+    """Return (best seconds, peak bytes) for fn, each run on a fresh session."""
+    best = float('inf')
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    db.session.expunge_all()
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return best, peak
+
+def cli_lines(products):
+    """Format products the way the CLI's product listing does."""
+    return [f"{p.id:<5} {p.name:<20} ${p.price:<9.2f} {p.quantity:<10} {p.category or 'N/A':<15}"
+            for p in products]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--products', type=int, default=20000)
+    parser.add_argument('--sales', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    with app.app_context():
+        db.session.bulk_insert_mappings(Product, [
+            {'name': f'Product {i}', 'price': 1.5 + i % 100, 'stored_quantity': i % 500,
+             'description': f'Description for product {i}', 'category': f'Category {i % 20}'}
+            for i in range(args.products)
+        ])
+        db.session.bulk_insert_mappings(Sale, [
+            {'user_id': 1, 'product_id': 1 + i % args.products, 'quantity': 1 + i % 5,
+             'unit_price': 2.0, 'total_amount': 2.0 * (1 + i % 5), 'sale_date': datetime.utcnow()}
+            for i in range(args.sales)
+        ])
+        db.session.commit()
+        LocationService.backfill_stock_levels()
+
+        cases = [
+            ('all products', lambda: Product.query.all(), InventoryService.get_all_products),
+            ('low stock', lambda: Product.query.filter(Product.quantity <= 10).all(),
+             InventoryService.get_low_stock_products),
+            ('CLI product listing', lambda: cli_lines(Product.query.all()),
+             lambda: cli_lines(InventoryService.get_all_products())),
+            ('sales by user + to_dict', lambda: [s.to_dict() for s in Sale.query.filter_by(user_id=1).all()],
+             lambda: [s.to_dict() for s in SalesService.get_sales_by_user(1)]),
+        ]
+
+        print(f"{'path':<26} {'ORM ms':>10} {'records ms':>12} {'ORM peak':>12} {'records peak':>14}")
+        for name, orm, records in cases:
+            orm_time, orm_peak = measure(orm, args.repeat)
+            rec_time, rec_peak = measure(records, args.repeat)
+            print(f"{name:<26} {orm_time * 1000:>10.1f} {rec_time * 1000:>12.1f} "
+                  f"{orm_peak / 1e6:>10.1f}MB {rec_peak / 1e6:>12.1f}MB")
+
+if __name__ == '__main__':
+    main()
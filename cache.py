@@ -0,0 +1,57 @@
+"""In-process caching of rendered template fragments.
+
+Cache keys include the catalog version, which the service layer bumps
+after every write that changes what the catalog views show, so stale
+fragments are never looked up again. Entries also expire after a TTL to
+bound staleness from writes made by other processes.
+"""
+from typing import Any, Callable, Hashable
+from collections import OrderedDict
+import threading
+import time
+
+_catalog_version = 0
+_version_lock = threading.Lock()
+
+def catalog_version() -> int:
+    """Get the current catalog version."""
+    return _catalog_version
+
+def bump_catalog_version() -> int:
+    """Invalidate cached catalog fragments by moving to a new version."""
+    global _catalog_version
+    with _version_lock:
+        _catalog_version += 1
+        return _catalog_version
+
+class FragmentCache:
+    """Bounded LRU cache of rendered fragments with a time-to-live."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        # Compute outside the lock; concurrent misses may render twice, which is harmless
+        value = compute()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop all cached fragments."""
+        with self._lock:
+            self._entries.clear()
@@ -1,8 +1,9 @@
 """Command-line interface for the Inventory Management System."""
+import argparse
 import sys
 from typing import Optional
 from models import db, User
-from services import InventoryService, SalesService, UserService
+from services import InventoryService, LocationService, SalesService, UserService
 from app import create_app
 import logging
 
@@ -146,7 +147,7 @@ class InventoryCLI:
         
         for sale in sales:
             date_str = sale.sale_date.strftime("%Y-%m-%d %H:%M")
-            print(f"{date_str:<20} {sale.product.name:<20} {sale.quantity:<5} ${sale.total_amount:<9.2f}")
+            print(f"{date_str:<20} {sale.product:<20} {sale.quantity:<5} ${sale.total_amount:<9.2f}")
     
     def view_low_stock(self):
         """View low stock products."""
@@ -170,7 +171,8 @@ class InventoryCLI:
             print("2. Update Product")
             print("3. Delete Product")
             print("4. Sales Report")
-            print("5. Back to Main Menu")
+            print("5. Transfer Stock")
+            print("6. Back to Main Menu")
             
             choice = input("Enter choice: ").strip()
             
@@ -183,6 +185,8 @@ class InventoryCLI:
             elif choice == '4':
                 self.sales_report()
             elif choice == '5':
+                self.transfer_stock()
+            elif choice == '6':
                 break
             else:
                 print("Invalid choice.")
@@ -243,6 +247,34 @@ class InventoryCLI:
         except ValueError:
             print("Invalid product ID.")
     
+    def transfer_stock(self):
+        """Move stock between locations."""
+        try:
+            product_id = int(input("Product ID: "))
+            levels = LocationService.get_stock_levels(product_id)
+            if not levels:
+                print("Product not found or not stocked.")
+                return
+            
+            print(f"\n{'Loc ID':<8} {'Location':<25} {'Stock':<10}")
+            print("-" * 45)
+            for level in levels:
+                print(f"{level.location_id:<8} {level.location.name:<25} {level.quantity:<10}")
+            
+            print("\nAll locations:")
+            for location in LocationService.get_all_locations():
+                print(f"  {location.id}. {location.name}")
+            
+            from_id = int(input("From location ID: "))
+            to_id = int(input("To location ID: "))
+            quantity = int(input("Quantity: "))
+            
+            result = LocationService.transfer_stock(product_id, from_id, to_id, quantity)
+            print(result['message'])
+            
+        except ValueError:
+            print("Invalid input.")
+    
     def sales_report(self):
         """Generate sales report."""
         try:
@@ -256,6 +288,58 @@ class InventoryCLI:
         except ValueError:
             print("Invalid input.")
 
-if __name__ == "__main__":
+def archive_sales(days: Optional[int], batch_size: int) -> int:
+    """Move old sales into the archive and report the result."""
+    app = create_app()
+    with app.app_context():
+        result = SalesService.archive_old_sales(days, batch_size)
+        print(result['message'])
+        for key in result['partitions']:
+            print(f"  partition {key}: verified")
+        return 0 if result['success'] else 1
+
+def run_worker(once: bool, job_name: Optional[str]) -> int:
+    """Run scheduled background jobs."""
+    from jobs import Scheduler
+    
+    scheduler = Scheduler(create_app())
+    if job_name:
+        run = scheduler.run_job(job_name)
+        print(f"{job_name}: {run['status']}")
+        return 0 if run['status'] == 'success' else 1
+    if once:
+        print(f"Ran {scheduler.run_pending()} due jobs")
+        return 0
+    
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        print("Worker stopped.")
+    return 0
+
+def main():
+    """Console script entry point."""
+    parser = argparse.ArgumentParser(prog='inventory-cli', description=__doc__)
+    commands = parser.add_subparsers(dest='command')
+    
+    archive = commands.add_parser('archive', help='move old sales into compressed archive files')
+    archive.add_argument('--days', type=int, default=None,
+                         help='archive sales older than this many days (default: SALES_RETENTION_DAYS)')
+    archive.add_argument('--batch-size', type=int, default=1000,
+                         help='sales moved and verified per batch')
+    
+    worker = commands.add_parser('worker', help='run scheduled background jobs')
+    worker.add_argument('--once', action='store_true', help='run due jobs once and exit')
+    worker.add_argument('--run', metavar='JOB', help='run one job now and exit')
+    
+    args = parser.parse_args()
+    if args.command == 'archive':
+        sys.exit(archive_sales(args.days, args.batch_size))
+    if args.command == 'worker':
+        sys.exit(run_worker(args.once, args.run))
+    
     cli = InventoryCLI()
-    cli.run()
\ No newline at end of file
+    cli.run()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
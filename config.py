@@ -9,7 +9,37 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///inventory.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Read replicas, from a comma-separated list of URLs
+    REPLICA_DATABASE_URIS = [
+        url for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url
+    ]
+    # Reads stay on the primary this long after a user's write
+    REPLICA_STICKY_SECONDS = float(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+    # Seconds between copies onto SQLite replicas (simulated lag); 0 disables
+    REPLICA_SYNC_INTERVAL = float(os.environ.get('REPLICA_SYNC_INTERVAL', 0))
+    # Run the job scheduler in the web process instead of 'inventory-cli worker'
+    SCHEDULER_IN_PROCESS = os.environ.get('SCHEDULER_IN_PROCESS', '').lower() in ('1', 'true', 'yes')
+    SCHEDULER_POLL_INTERVAL = int(os.environ.get('SCHEDULER_POLL_INTERVAL', 30))
+    # A claimed job is considered abandoned and runs again after this long
+    JOB_LEASE_SECONDS = 3600
+    JOB_HISTORY_DAYS = int(os.environ.get('JOB_HISTORY_DAYS', 30))
+    # Admin pages recompute the report if the precomputed one is older than this
+    REPORT_MAX_AGE = int(os.environ.get('REPORT_MAX_AGE', 3600))
+    # Async driver URL for the ASGI read API; derived from the main URI when unset
+    ASYNC_DATABASE_URL = os.environ.get('ASYNC_DATABASE_URL')
     LOW_STOCK_THRESHOLD = int(os.environ.get('LOW_STOCK_THRESHOLD', 10))
+    DASHBOARD_PAGE_SIZE = int(os.environ.get('DASHBOARD_PAGE_SIZE', 50))
+    # Rendered fragments are also invalidated by catalog writes in this process
+    FRAGMENT_CACHE_TTL = int(os.environ.get('FRAGMENT_CACHE_TTL', 30))
+    # Responses smaller than this many bytes are sent uncompressed
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = 6
+    # Sales older than the retention period move to compressed archive files;
+    # a relative directory is resolved against the app instance folder
+    SALES_ARCHIVE_DIR = os.environ.get('SALES_ARCHIVE_DIR') or 'archive'
+    SALES_RETENTION_DAYS = int(os.environ.get('SALES_RETENTION_DAYS', 365))
+    # Seconds a checkout hold keeps stock before it lapses back to available
+    RESERVATION_TTL = int(os.environ.get('RESERVATION_TTL', 600))
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -19,8 +49,14 @@ class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
 
+class TestingConfig(Config):
+    """Testing configuration."""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
\ No newline at end of file
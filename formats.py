@@ -0,0 +1,118 @@
+"""Response formats for bulk API endpoints.
+
+Bulk endpoints build responses straight from row tuples. Clients pick a
+shape with the ``Accept`` header (or ``?format=``):
+
+- ``application/json`` (default): list of objects, as before
+- ``application/vnd.inventory.columnar+json``: one array per field
+- ``application/msgpack``: the columnar shape as MessagePack
+
+Large responses are gzip/deflate compressed when the client accepts it.
+"""
+from typing import Any, Dict, List, Sequence
+from datetime import datetime
+from flask import Request, Response, current_app
+from read_models import ProductRecord, SaleRecord
+import gzip
+import json
+import msgpack
+import zlib
+
+COLUMNAR_MIMETYPE = 'application/vnd.inventory.columnar+json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+FORMATS = {
+    'json': 'application/json',
+    'columnar': COLUMNAR_MIMETYPE,
+    'msgpack': MSGPACK_MIMETYPE,
+}
+
+PRODUCT_FIELDS = ProductRecord._fields
+SALE_FIELDS = SaleRecord._fields
+DATETIME_FIELDS = {'sale_date'}
+
+COMPRESSIBLE_MIMETYPES = {'application/json', COLUMNAR_MIMETYPE, MSGPACK_MIMETYPE, 'text/html'}
+
+def negotiate(request: Request) -> str:
+    """Pick the response format a client asked for."""
+    requested = request.args.get('format')
+    if requested in FORMATS:
+        return requested
+
+    best = request.accept_mimetypes.best_match(
+        [FORMATS['json'], COLUMNAR_MIMETYPE, MSGPACK_MIMETYPE, 'application/x-msgpack'],
+        default=FORMATS['json']
+    )
+    if best in (MSGPACK_MIMETYPE, 'application/x-msgpack'):
+        return 'msgpack'
+    if best == COLUMNAR_MIMETYPE:
+        return 'columnar'
+    return 'json'
+
+def _plain_rows(fields: Sequence[str], rows: List[tuple]) -> List[tuple]:
+    """Render datetime fields as ISO strings, like the models' ``to_dict``."""
+    dates = [i for i, field in enumerate(fields) if field in DATETIME_FIELDS]
+    if not dates:
+        return rows
+
+    plain = []
+    for row in rows:
+        row = list(row)
+        for i in dates:
+            if isinstance(row[i], datetime):
+                row[i] = row[i].isoformat()
+        plain.append(row)
+    return plain
+
+def to_records(fields: Sequence[str], rows: List[tuple]) -> List[Dict[str, Any]]:
+    """Rows as a list of objects, matching the models' ``to_dict``."""
+    return [dict(zip(fields, row)) for row in _plain_rows(fields, rows)]
+
+def to_columns(fields: Sequence[str], rows: List[tuple]) -> Dict[str, Any]:
+    """Rows as one array per field."""
+    rows = _plain_rows(fields, rows)
+    columns = zip(*rows) if rows else [()] * len(fields)
+    return {
+        'count': len(rows),
+        'columns': {field: list(column) for field, column in zip(fields, columns)}
+    }
+
+def rows_response(fmt: str, fields: Sequence[str], rows: List[tuple],
+                  envelope: Dict[str, Any] = None, key: str = None) -> Response:
+    """Serialize rows in the negotiated format.
+
+    With an ``envelope`` the rows are placed under ``key`` inside it,
+    otherwise they are the whole body.
+    """
+    data = to_records(fields, rows) if fmt == 'json' else to_columns(fields, rows)
+    if envelope is not None:
+        data = dict(envelope, **{key: data})
+
+    if fmt == 'msgpack':
+        body = msgpack.packb(data, use_bin_type=True)
+    else:
+        body = json.dumps(data, separators=(',', ':'))
+    return Response(body, mimetype=FORMATS[fmt])
+
+def compress_response(request: Request, response: Response) -> Response:
+    """Compress large responses with gzip or deflate if the client accepts it."""
+    if (response.direct_passthrough
+            or response.status_code != 200
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < current_app.config['COMPRESS_MIN_SIZE']:
+        return response
+
+    level = current_app.config['COMPRESS_LEVEL']
+    encodings = request.accept_encodings
+    if encodings['gzip']:
+        response.set_data(gzip.compress(body, compresslevel=level))
+        response.headers['Content-Encoding'] = 'gzip'
+    elif encodings['deflate']:
+        response.set_data(zlib.compress(body, level))
+        response.headers['Content-Encoding'] = 'deflate'
+    return response
@@ -0,0 +1,254 @@
+"""Background job scheduler for reports and maintenance.
+
+Jobs are registered with the ``job`` decorator and a cron-style schedule
+(``minute hour day month weekday``, evaluated in UTC). Their state lives in
+the ``Job`` table and every attempt is recorded as a ``JobRun``, so several
+workers can share one database: a due job is claimed with a conditional
+update before it runs, and failed attempts are retried with backoff.
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from datetime import datetime, time as dt_time, timedelta
+from flask import current_app
+from sqlalchemy import text, update
+from models import db, Job, JobRun
+from services import InventoryService, ReservationService, SalesService
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class CronSchedule:
+    """Five-field cron expression supporting ``*``, lists, ranges and steps."""
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f'Cron expression needs 5 fields: {expression!r}')
+
+        self.expression = expression
+        self.minutes = self._parse(fields[0], 0, 59)
+        self.hours = self._parse(fields[1], 0, 23)
+        self.days = self._parse(fields[2], 1, 31)
+        self.months = self._parse(fields[3], 1, 12)
+        # Cron weekdays run Sunday=0 (or 7) to Saturday=6
+        self.weekdays = {day % 7 for day in self._parse(fields[4], 0, 7)}
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int) -> List[int]:
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step = part.split('/')
+                step = int(step)
+
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start, end = map(int, part.split('-'))
+            else:
+                start = int(part)
+                end = high if step != 1 else start
+
+            if step < 1 or start < low or end > high or start > end:
+                raise ValueError(f'Invalid cron field: {field!r}')
+            values.update(range(start, end + 1, step))
+        return sorted(values)
+
+    def _matches_day(self, day) -> bool:
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        if self.any_day and self.any_weekday:
+            return True
+        if self.any_day:
+            return in_weekdays
+        if self.any_weekday:
+            return in_days
+        # Like cron, a restricted day of month and weekday match either
+        return in_days or in_weekdays
+
+    def next_after(self, after: datetime) -> datetime:
+        """Get the first matching minute strictly after ``after``."""
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.date()
+        for _ in range(366 * 5):
+            if self._matches_day(day):
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        candidate = datetime.combine(day, dt_time(hour, minute))
+                        if candidate >= start:
+                            return candidate
+            day += timedelta(days=1)
+        raise ValueError(f'Cron expression never matches: {self.expression!r}')
+
+class JobDefinition(NamedTuple):
+    func: Callable[[], Any]
+    schedule: str
+    max_retries: int
+    retry_delay: int
+
+JOBS: Dict[str, JobDefinition] = {}
+
+def job(name: str, schedule: str, max_retries: int = 3, retry_delay: int = 60):
+    """Register a function as a scheduled job.
+
+    The function runs inside an app context and may return a
+    JSON-serializable result, which is stored with the run.
+    """
+    CronSchedule(schedule)
+
+    def register(func):
+        JOBS[name] = JobDefinition(func, schedule, max_retries, retry_delay)
+        return func
+    return register
+
+@job('sales_report', '*/15 * * * *')
+def sales_report():
+    """Precompute the admin sales report."""
+    return SalesService.get_sales_summary(recent=10)
+
+@job('expire_reservations', '* * * * *')
+def expire_reservations():
+    """Return the stock of lapsed checkout holds."""
+    return {'expired': ReservationService.expire_reservations()}
+
+@job('archive_sales', '0 2 * * *', max_retries=1)
+def archive_sales():
+    """Move sales past the retention period into the archive."""
+    result = SalesService.archive_old_sales()
+    if not result['success']:
+        raise RuntimeError(result['message'])
+    return result
+
+@job('reconcile_stock', '30 2 * * *')
+def reconcile_stock():
+    """Refresh the stored product totals from their stock level rows."""
+    return {'refreshed': InventoryService.reconcile_stock_totals()}
+
+@job('database_maintenance', '0 3 * * 0')
+def database_maintenance():
+    """Prune old run history, refresh planner statistics and compact SQLite."""
+    cutoff = datetime.utcnow() - timedelta(days=current_app.config['JOB_HISTORY_DAYS'])
+    pruned = JobRun.query.filter(JobRun.started_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+
+    # ANALYZE and VACUUM cannot run inside a transaction
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.execute(text('ANALYZE'))
+        if db.engine.dialect.name == 'sqlite':
+            conn.execute(text('VACUUM'))
+    return {'pruned_runs': pruned}
+
+class Scheduler:
+    """Runs due jobs from the job table."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def sync_jobs(self) -> None:
+        """Add rows for registered jobs missing from the job table.
+
+        Existing rows are left alone, so schedules can be changed in the table.
+        """
+        existing = {name for (name,) in db.session.query(Job.name)}
+        now = datetime.utcnow()
+        for name, definition in JOBS.items():
+            if name not in existing:
+                db.session.add(Job(
+                    name=name,
+                    schedule=definition.schedule,
+                    max_retries=definition.max_retries,
+                    retry_delay=definition.retry_delay,
+                    next_run_at=CronSchedule(definition.schedule).next_after(now)
+                ))
+        db.session.commit()
+
+    def run_pending(self, now: Optional[datetime] = None) -> int:
+        """Run every enabled job that is due; returns how many ran."""
+        with self.app.app_context():
+            self.sync_jobs()
+            now = now or datetime.utcnow()
+            due = Job.query.filter(
+                Job.enabled.is_(True),
+                Job.next_run_at <= now
+            ).order_by(Job.next_run_at).all()
+
+            ran = 0
+            for row in due:
+                if row.name in JOBS and self._claim(row, now):
+                    self._run(row, now)
+                    ran += 1
+            return ran
+
+    def run_job(self, name: str) -> Dict[str, Any]:
+        """Run a job immediately, regardless of its schedule."""
+        if name not in JOBS:
+            raise ValueError(f'Unknown job: {name}')
+        with self.app.app_context():
+            self.sync_jobs()
+            return self._run(Job.query.filter_by(name=name).one(), datetime.utcnow()).to_dict()
+
+    def run_forever(self, poll_interval: float = None) -> None:
+        """Poll for due jobs until interrupted."""
+        poll_interval = poll_interval or self.app.config['SCHEDULER_POLL_INTERVAL']
+        logger.info(f"Worker started with jobs: {', '.join(sorted(JOBS))}")
+        while True:
+            try:
+                self.run_pending()
+            except Exception:
+                logger.exception("Scheduler poll failed")
+            time.sleep(poll_interval)
+
+    def _claim(self, row: Job, now: datetime) -> bool:
+        """Lease a due job so no other worker starts it too."""
+        lease = now + timedelta(seconds=self.app.config['JOB_LEASE_SECONDS'])
+        claimed = db.session.execute(
+            update(Job).where(
+                Job.id == row.id,
+                Job.next_run_at == row.next_run_at
+            ).values(next_run_at=lease)
+        ).rowcount
+        db.session.commit()
+        return bool(claimed)
+
+    def _run(self, row: Job, now: datetime) -> JobRun:
+        run = JobRun(job_name=row.name, attempt=row.attempt)
+        db.session.add(run)
+        db.session.commit()
+
+        try:
+            result = JOBS[row.name].func()
+        except Exception as e:
+            db.session.rollback()
+            logger.exception(f"Job {row.name} failed (attempt {row.attempt + 1})")
+            run.status = 'failed'
+            run.error = f'{type(e).__name__}: {e}'
+            if row.attempt < row.max_retries:
+                row.next_run_at = datetime.utcnow() + timedelta(seconds=row.retry_delay * 2 ** row.attempt)
+                row.attempt += 1
+            else:
+                row.attempt = 0
+                row.next_run_at = CronSchedule(row.schedule).next_after(now)
+        else:
+            run.status = 'success'
+            run.result = json.dumps(result) if result is not None else None
+            row.attempt = 0
+            row.next_run_at = CronSchedule(row.schedule).next_after(now)
+            logger.info(f"Job {row.name} succeeded")
+
+        run.finished_at = datetime.utcnow()
+        row.last_run_at = now
+        db.session.commit()
+        return run
+
+def start_scheduler_thread(app) -> threading.Thread:
+    """Run the scheduler inside the web process."""
+    thread = threading.Thread(target=Scheduler(app).run_forever, name='scheduler', daemon=True)
+    thread.start()
+    return thread
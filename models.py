@@ -4,6 +4,7 @@ from typing import Optional
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
+import json
 
 db = SQLAlchemy()
 
@@ -30,7 +31,9 @@ class Product(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     price = db.Column(db.Float, nullable=False)
-    quantity = db.Column(db.Integer, nullable=False, default=0)
+    # Snapshot of the total, refreshed by the reconcile_stock job. Stock
+    # writes never touch the product row; read ``quantity`` for the live total
+    stored_quantity = db.Column('quantity', db.Integer, nullable=False, default=0)
     description = db.Column(db.Text)
     category = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -51,6 +54,50 @@ class Product(db.Model):
             'category': self.category
         }
 
+class Location(db.Model):
+    """Location model for warehouses and stores holding stock."""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self) -> dict:
+        """Convert location to dictionary."""
+        return {
+            'id': self.id,
+            'name': self.name
+        }
+
+class StockLevel(db.Model):
+    """Stock of one product held at one location."""
+    __table_args__ = (db.UniqueConstraint('product_id', 'location_id'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('product.id'), nullable=False, index=True)
+    location_id = db.Column(db.Integer, db.ForeignKey('location.id'), nullable=False, index=True)
+    # Available units; held units are tracked on Reservation rows
+    quantity = db.Column(db.Integer, nullable=False, default=0)
+    
+    product = db.relationship('Product', backref=db.backref('stock_levels', cascade='all, delete-orphan'))
+    location = db.relationship('Location', backref='stock_levels')
+    
+    def to_dict(self) -> dict:
+        """Convert stock level to dictionary."""
+        return {
+            'product_id': self.product_id,
+            'location_id': self.location_id,
+            'location': self.location.name,
+            'quantity': self.quantity
+        }
+
+# Live available total across locations, summed through the product_id index,
+# so a checkout only writes the stock level rows it draws from
+Product.quantity = db.column_property(
+    db.select(db.func.coalesce(db.func.sum(StockLevel.quantity), 0))
+    .where(StockLevel.product_id == Product.id)
+    .correlate_except(StockLevel)
+    .scalar_subquery()
+)
+
 class Sale(db.Model):
     """Sale model for transaction records."""
     id = db.Column(db.Integer, primary_key=True)
@@ -74,4 +121,95 @@ class Sale(db.Model):
             'unit_price': self.unit_price,
             'total_amount': self.total_amount,
             'sale_date': self.sale_date.isoformat()
-        }
\ No newline at end of file
+        }
+
+class Reservation(db.Model):
+    """Checkout hold on stock that lapses at ``expires_at``.
+    
+    Held units are taken out of the available stock level rows when the
+    hold is placed and put back when it is released or expires.
+    """
+    # Expiry looks up active holds in due order without scanning the table,
+    # across all products or for one product short of stock
+    __table_args__ = (
+        db.Index('ix_reservation_status_expires_at', 'status', 'expires_at'),
+        db.Index('ix_reservation_product_status_expires_at', 'product_id', 'status', 'expires_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    product_id = db.Column(db.Integer, db.ForeignKey('product.id'), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    # Price is fixed when the hold is placed
+    unit_price = db.Column(db.Float, nullable=False)
+    # JSON list of [location_id, quantity] pairs the held units came from
+    allocations = db.Column(db.Text, nullable=False)
+    # active, confirmed, released or expired
+    status = db.Column(db.String(20), nullable=False, default='active')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    
+    user = db.relationship('User', backref='reservations')
+    product = db.relationship('Product', backref=db.backref('reservations', cascade='all, delete-orphan'))
+    
+    def to_dict(self) -> dict:
+        """Convert reservation to dictionary."""
+        return {
+            'id': self.id,
+            'product_id': self.product_id,
+            'product': self.product.name,
+            'quantity': self.quantity,
+            'unit_price': self.unit_price,
+            'status': self.status,
+            'allocations': [
+                {'location_id': location_id, 'quantity': quantity}
+                for location_id, quantity in json.loads(self.allocations)
+            ],
+            'expires_at': self.expires_at.isoformat()
+        }
+
+class Job(db.Model):
+    """Scheduled background job and when it is next due."""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    schedule = db.Column(db.String(100), nullable=False)
+    enabled = db.Column(db.Boolean, nullable=False, default=True)
+    max_retries = db.Column(db.Integer, nullable=False, default=3)
+    retry_delay = db.Column(db.Integer, nullable=False, default=60)
+    attempt = db.Column(db.Integer, nullable=False, default=0)
+    next_run_at = db.Column(db.DateTime, index=True)
+    last_run_at = db.Column(db.DateTime)
+    
+    def to_dict(self) -> dict:
+        """Convert job to dictionary."""
+        return {
+            'name': self.name,
+            'schedule': self.schedule,
+            'enabled': self.enabled,
+            'attempt': self.attempt,
+            'next_run_at': self.next_run_at.isoformat() if self.next_run_at else None,
+            'last_run_at': self.last_run_at.isoformat() if self.last_run_at else None
+        }
+
+class JobRun(db.Model):
+    """One execution attempt of a background job."""
+    id = db.Column(db.Integer, primary_key=True)
+    job_name = db.Column(db.String(100), nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False, default='running')
+    attempt = db.Column(db.Integer, nullable=False, default=0)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    result = db.Column(db.Text)
+    error = db.Column(db.Text)
+    
+    def to_dict(self) -> dict:
+        """Convert job run to dictionary."""
+        return {
+            'id': self.id,
+            'job': self.job_name,
+            'status': self.status,
+            'attempt': self.attempt,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'error': self.error
+        }
@@ -0,0 +1,50 @@
+"""Lightweight read models for hot read paths.
+
+Listings load plain named tuples from column-only queries instead of ORM
+instances: no identity map, change tracking or lazy relationships. Use the
+models in ``models.py`` for anything that writes.
+"""
+from typing import NamedTuple, Optional
+from datetime import datetime
+from models import Product, Sale, User
+
+class ProductRecord(NamedTuple):
+    """Read-only product row."""
+    id: int
+    name: str
+    price: float
+    quantity: int
+    description: Optional[str]
+    category: Optional[str]
+
+    def is_low_stock(self, threshold: int = 10) -> bool:
+        """Check if product is low in stock."""
+        return self.quantity <= threshold
+
+    def to_dict(self) -> dict:
+        """Convert product to dictionary, matching ``Product.to_dict``."""
+        return self._asdict()
+
+class SaleRecord(NamedTuple):
+    """Read-only sale row with user and product names resolved."""
+    id: int
+    user: str
+    product: str
+    quantity: int
+    unit_price: float
+    total_amount: float
+    sale_date: datetime
+
+    def to_dict(self) -> dict:
+        """Convert sale to dictionary, matching ``Sale.to_dict``."""
+        return dict(self._asdict(), sale_date=self.sale_date.isoformat())
+
+# Columns to select, in record field order
+PRODUCT_COLUMNS = (Product.id, Product.name, Product.price, Product.quantity,
+                   Product.description, Product.category)
+SALE_COLUMNS = (Sale.id, User.username, Product.name, Sale.quantity,
+                Sale.unit_price, Sale.total_amount, Sale.sale_date)
+
+def sale_record_joins(query):
+    """Add the joins ``SALE_COLUMNS`` needs to a query or select."""
+    return query.outerjoin(User, Sale.user_id == User.id).outerjoin(Product, Sale.product_id == Product.id)
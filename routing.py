@@ -0,0 +1,126 @@
+"""Read/write routing between the primary database and read replicas.
+
+Replica engines are created from ``REPLICA_DATABASE_URIS``. Read-only
+service methods query through ``read_session()``, which returns a replica
+session unless the current app context or user session wrote recently,
+in which case reads stay on the primary so users see their own writes.
+"""
+from flask import current_app, g, has_app_context, has_request_context, session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from flask_sqlalchemy.query import Query
+from models import db
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+def init_replicas(app) -> None:
+    """Create engines for the app's configured read replicas."""
+    engines = []
+    for uri in app.config['REPLICA_DATABASE_URIS']:
+        url = make_url(uri)
+        options = {}
+        if url.get_backend_name() == 'sqlite':
+            if url.database in (None, '', ':memory:'):
+                # One shared connection, so the in-memory replica persists
+                options = {'poolclass': StaticPool, 'connect_args': {'check_same_thread': False}}
+            elif not os.path.isabs(url.database):
+                # Resolve like Flask-SQLAlchemy does for the primary
+                url = url.set(database=os.path.join(app.instance_path, url.database))
+        engines.append(create_engine(url, **options))
+    app.extensions['replica_engines'] = engines
+
+def replica_engines() -> list:
+    """Get the current app's read replica engines."""
+    return current_app.extensions.get('replica_engines', [])
+
+def mark_write() -> None:
+    """Pin reads to the primary for this app context and, briefly, this user."""
+    if has_app_context():
+        g._db_wrote = True
+    if has_request_context():
+        session['_last_write'] = time.time()
+
+def _reads_from_primary() -> bool:
+    if g.get('_db_wrote'):
+        return True
+    if has_request_context():
+        last_write = session.get('_last_write')
+        sticky = current_app.config['REPLICA_STICKY_SECONDS']
+        return last_write is not None and time.time() - last_write < sticky
+    return False
+
+def read_session():
+    """Session for read-only queries: a replica, or the primary after a write."""
+    engines = replica_engines()
+    if not engines or _reads_from_primary():
+        return db.session
+
+    if 'replica_session' not in g:
+        # Flask-SQLAlchemy's query class keeps .paginate() available on replicas
+        g.replica_session = Session(bind=random.choice(engines), query_cls=Query)
+    return g.replica_session
+
+def close_read_session(exc=None) -> None:
+    """Release the app context's replica session, if any."""
+    replica_session = g.pop('replica_session', None)
+    if replica_session is not None:
+        replica_session.close()
+
+@event.listens_for(db.session, 'after_flush')
+def _after_flush(db_session, flush_context):
+    mark_write()
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _after_bulk_write(orm_execute_state):
+    # Bulk UPDATE/DELETE statements change rows without a flush
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mark_write()
+
+def sync_sqlite_replicas() -> int:
+    """Copy the primary SQLite database onto each SQLite replica.
+
+    Stands in for replication in development and tests; the time between
+    syncs is the simulated replica lag.
+    """
+    primary = db.engine
+    if primary.dialect.name != 'sqlite':
+        return 0
+
+    close_read_session()
+    synced = 0
+    for replica in replica_engines():
+        if replica.dialect.name != 'sqlite':
+            continue
+
+        source = primary.raw_connection()
+        target = replica.raw_connection()
+        try:
+            source.driver_connection.backup(target.driver_connection)
+            synced += 1
+        finally:
+            target.close()
+            source.close()
+    return synced
+
+def start_replica_sync(app, interval: float) -> threading.Thread:
+    """Keep simulated SQLite replicas in sync from a background thread."""
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                with app.app_context():
+                    sync_sqlite_replicas()
+            except Exception:
+                logger.exception("Replica sync failed")
+
+    thread = threading.Thread(target=run, name='replica-sync', daemon=True)
+    thread.start()
+    logger.info(f"Syncing SQLite replicas every {interval}s")
+    return thread
@@ -10,6 +10,12 @@ def main():
         from cli import InventoryCLI
         cli = InventoryCLI()
         cli.run()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'asgi':
+        # Run async read API
+        import uvicorn
+        from asgi import create_asgi_app
+        print("Starting async read API at http://localhost:8000")
+        uvicorn.run(create_asgi_app(), host='0.0.0.0', port=8000)
     else:
         # Run web version
         app = create_app()
@@ -1,7 +1,17 @@
 """Business logic services for the Inventory Management System."""
 from typing import List, Optional, Dict, Any
-from models import db, Product, Sale, User
+from flask import current_app
+from models import db, Product, Sale, User, Location, StockLevel, Reservation, Job, JobRun
+from archive import ArchivedSale, SalesArchive
+from cache import bump_catalog_version
+from routing import read_session
+from read_models import ProductRecord, SaleRecord, PRODUCT_COLUMNS, SALE_COLUMNS, sale_record_joins
 from datetime import datetime, timedelta
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+import asyncio
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,9 +20,26 @@ class InventoryService:
     """Service class for inventory operations."""
     
     @staticmethod
-    def get_all_products() -> List[Product]:
+    def _product_records(statement) -> List[ProductRecord]:
+        return [ProductRecord._make(row) for row in read_session().execute(statement)]
+    
+    @staticmethod
+    def get_all_products() -> List[ProductRecord]:
         """Get all products."""
-        return Product.query.all()
+        return InventoryService._product_records(select(*PRODUCT_COLUMNS).order_by(Product.id))
+    
+    @staticmethod
+    def get_products_page(page: int = 1, per_page: int = 50):
+        """Get one page of products ordered by ID, as records.
+        
+        Reads the primary: the page feeds the dashboard cache, which is keyed
+        on a catalog version bumped as soon as the primary commits.
+        """
+        pagination = db.session.query(*PRODUCT_COLUMNS).order_by(Product.id).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+        pagination.items = [ProductRecord._make(row) for row in pagination.items]
+        return pagination
     
     @staticmethod
     def get_product_by_id(product_id: int) -> Optional[Product]:
@@ -20,41 +47,56 @@ class InventoryService:
         return Product.query.get(product_id)
     
     @staticmethod
-    def search_products(query: str) -> List[Product]:
+    def search_products(query: str) -> List[ProductRecord]:
         """Search products by name or category."""
-        return Product.query.filter(
+        return InventoryService._product_records(select(*PRODUCT_COLUMNS).where(
             Product.name.contains(query) | Product.category.contains(query)
-        ).all()
+        ).order_by(Product.id))
     
     @staticmethod
     def add_product(name: str, price: float, quantity: int, 
-                   description: str = None, category: str = None) -> Product:
-        """Add new product to inventory."""
+                   description: str = None, category: str = None,
+                   location_id: int = None) -> Product:
+        """Add new product to inventory, stocked at one location."""
+        if location_id is None:
+            location_id = LocationService.get_default_location().id
+        
         product = Product(
             name=name,
             price=price,
-            quantity=quantity,
+            stored_quantity=quantity,
             description=description,
             category=category
         )
+        product.stock_levels.append(StockLevel(location_id=location_id, quantity=quantity))
         db.session.add(product)
         db.session.commit()
+        bump_catalog_version()
         logger.info(f"Added product: {name}")
         return product
     
     @staticmethod
     def update_product(product_id: int, **kwargs) -> Optional[Product]:
-        """Update product details."""
+        """Update product details.
+        
+        A new ``quantity`` is treated as a stock count correction of the
+        product's total; see ``LocationService._correct_total``.
+        """
         product = Product.query.get(product_id)
         if not product:
             return None
         
+        quantity = kwargs.pop('quantity', None)
+        if quantity is not None:
+            LocationService._correct_total(product.id, quantity)
+        
         for key, value in kwargs.items():
             if hasattr(product, key):
                 setattr(product, key, value)
         
         product.updated_at = datetime.utcnow()
         db.session.commit()
+        bump_catalog_version()
         logger.info(f"Updated product: {product.name}")
         return product
     
@@ -67,30 +109,233 @@ class InventoryService:
         
         db.session.delete(product)
         db.session.commit()
+        bump_catalog_version()
         logger.info(f"Deleted product: {product.name}")
         return True
     
     @staticmethod
-    def get_low_stock_products(threshold: int = 10) -> List[Product]:
-        """Get products with low stock."""
-        return Product.query.filter(Product.quantity <= threshold).all()
+    def get_low_stock_products(threshold: int = 10, location_id: int = None) -> List[ProductRecord]:
+        """Get products with low stock overall or at one location.
+        
+        For a location, each record's ``quantity`` is the stock held there.
+        """
+        if location_id is None:
+            return InventoryService._product_records(
+                select(*PRODUCT_COLUMNS).where(Product.quantity <= threshold).order_by(Product.id)
+            )
+        
+        columns = [StockLevel.quantity if column is Product.quantity else column
+                   for column in PRODUCT_COLUMNS]
+        return InventoryService._product_records(select(*columns).join(StockLevel).where(
+            StockLevel.location_id == location_id,
+            StockLevel.quantity <= threshold
+        ).order_by(Product.id))
+
+    @staticmethod
+    def count_low_stock_products(threshold: int = 10) -> int:
+        """Count products with low stock without loading them.
+        
+        Sums every product's stock level rows; callers that poll should
+        cache the result.
+        """
+        return Product.query.filter(Product.quantity <= threshold).count()
+
+    @staticmethod
+    def reconcile_stock_totals() -> int:
+        """Refresh stored product totals that differ from their stock levels."""
+        refreshed = db.session.execute(
+            update(Product).where(
+                Product.stock_levels.any(),
+                Product.stored_quantity != Product.quantity
+            ).values(stored_quantity=Product.quantity),
+            execution_options={'synchronize_session': False}
+        ).rowcount
+        db.session.commit()
+        if refreshed:
+            logger.info(f"Refreshed stored stock totals for {refreshed} products")
+        return refreshed
+
+class LocationService:
+    """Service class for stock location operations."""
+    
+    DEFAULT_LOCATION_NAME = 'Main Warehouse'
+    
+    @staticmethod
+    def create_location(name: str) -> Location:
+        """Create new stock location."""
+        location = Location(name=name)
+        db.session.add(location)
+        db.session.commit()
+        logger.info(f"Created location: {name}")
+        return location
+    
+    @staticmethod
+    def get_all_locations() -> List[Location]:
+        """Get all locations."""
+        return Location.query.order_by(Location.id).all()
+    
+    @staticmethod
+    def get_default_location() -> Location:
+        """Get the default location, creating it if none exist."""
+        location = Location.query.order_by(Location.id).first()
+        if not location:
+            location = Location(name=LocationService.DEFAULT_LOCATION_NAME)
+            db.session.add(location)
+            db.session.flush()
+        return location
+    
+    @staticmethod
+    def get_stock_levels(product_id: int) -> List[StockLevel]:
+        """Get per-location stock for a product."""
+        return StockLevel.query.filter_by(product_id=product_id).order_by(StockLevel.location_id).all()
+    
+    @staticmethod
+    def get_location_summary() -> List[Dict[str, Any]]:
+        """Get total units and product count held at each location.
+        
+        Aggregates over all stock level rows on each call. Totals are not
+        maintained on write on purpose: a per-location total row would be
+        updated by every checkout at that location. Callers that poll
+        should cache the result.
+        """
+        rows = db.session.query(
+            Location.id,
+            Location.name,
+            func.coalesce(func.sum(StockLevel.quantity), 0),
+            func.count(StockLevel.id)
+        ).outerjoin(StockLevel).group_by(Location.id).order_by(Location.id).all()
+        
+        return [
+            {'id': id, 'name': name, 'total_quantity': total, 'product_count': count}
+            for id, name, total, count in rows
+        ]
+    
+    @staticmethod
+    def _apply_adjustment(product_id: int, location_id: int, delta: int) -> StockLevel:
+        """Change stock at a location, without committing."""
+        level = StockLevel.query.filter_by(product_id=product_id, location_id=location_id).first()
+        current = level.quantity if level else 0
+        if current + delta < 0:
+            raise ValueError(f"Cannot remove {-delta} units; location holds {current}")
+        
+        if not level:
+            level = StockLevel(product_id=product_id, location_id=location_id, quantity=0)
+            db.session.add(level)
+        level.quantity = current + delta
+        return level
+    
+    @staticmethod
+    def _correct_total(product_id: int, quantity: int) -> None:
+        """Set a product's total stock, without committing.
+        
+        Added units go to the default location. Removed units come from the
+        default location first, then from the best-stocked other locations,
+        so any non-negative total can be applied.
+        """
+        if quantity < 0:
+            raise ValueError("Stock cannot be negative")
+        
+        default = LocationService.get_default_location()
+        levels = StockLevel.query.filter_by(product_id=product_id).all()
+        delta = quantity - sum(level.quantity for level in levels)
+        if delta > 0:
+            LocationService._apply_adjustment(product_id, default.id, delta)
+            return
+        
+        remaining = -delta
+        for level in sorted(levels, key=lambda level: (level.location_id != default.id, -level.quantity)):
+            if not remaining:
+                break
+            take = min(level.quantity, remaining)
+            level.quantity -= take
+            remaining -= take
+    
+    @staticmethod
+    def adjust_stock(product_id: int, location_id: int, delta: int) -> StockLevel:
+        """Receive (positive delta) or write off (negative delta) stock at a location."""
+        level = LocationService._apply_adjustment(product_id, location_id, delta)
+        db.session.commit()
+        bump_catalog_version()
+        logger.info(f"Adjusted stock of product {product_id} at location {location_id} by {delta}")
+        return level
+    
+    @staticmethod
+    def transfer_stock(product_id: int, from_location_id: int, to_location_id: int,
+                       quantity: int) -> Dict[str, Any]:
+        """Move stock between locations; the product total is unchanged."""
+        if quantity <= 0:
+            return {'success': False, 'message': 'Quantity must be positive'}
+        if from_location_id == to_location_id:
+            return {'success': False, 'message': 'Source and destination are the same'}
+        if not Location.query.get(to_location_id):
+            return {'success': False, 'message': 'Location not found'}
+        
+        # Conditional decrement so concurrent transfers cannot overdraw the source
+        moved = db.session.execute(
+            update(StockLevel).where(
+                StockLevel.product_id == product_id,
+                StockLevel.location_id == from_location_id,
+                StockLevel.quantity >= quantity
+            ).values(quantity=StockLevel.quantity - quantity)
+        ).rowcount
+        if not moved:
+            db.session.rollback()
+            return {'success': False, 'message': 'Insufficient stock at source location'}
+        
+        level = StockLevel.query.filter_by(product_id=product_id, location_id=to_location_id).first()
+        if not level:
+            level = StockLevel(product_id=product_id, location_id=to_location_id, quantity=0)
+            db.session.add(level)
+        level.quantity += quantity
+        db.session.commit()
+        bump_catalog_version()
+        
+        logger.info(f"Transferred {quantity} of product {product_id} "
+                    f"from location {from_location_id} to {to_location_id}")
+        return {'success': True, 'message': 'Transfer completed successfully'}
+    
+    @staticmethod
+    def backfill_stock_levels() -> int:
+        """Give products without stock rows their quantity at the default location."""
+        products = Product.query.filter(~Product.stock_levels.any()).all()
+        if not products:
+            return 0
+        
+        location = LocationService.get_default_location()
+        for product in products:
+            db.session.add(StockLevel(product_id=product.id, location_id=location.id,
+                                      quantity=product.stored_quantity))
+        db.session.commit()
+        bump_catalog_version()
+        logger.info(f"Backfilled stock levels for {len(products)} products")
+        return len(products)
 
 class SalesService:
     """Service class for sales operations."""
     
     @staticmethod
-    def create_sale(user_id: int, product_id: int, quantity: int) -> Dict[str, Any]:
-        """Create a new sale transaction."""
+    def create_sale(user_id: int, product_id: int, quantity: int,
+                    location_id: int = None) -> Dict[str, Any]:
+        """Create a new sale transaction.
+        
+        Stock is taken from ``location_id`` when given, otherwise from the
+        best-stocked location, splitting across locations only if needed.
+        """
         product = Product.query.get(product_id)
         if not product:
             return {'success': False, 'message': 'Product not found'}
         
-        if product.quantity < quantity:
+        levels, allocations = SalesService._allocate_available(product_id, quantity, location_id)
+        if allocations is None:
             return {
                 'success': False, 
-                'message': f'Insufficient stock. Available: {product.quantity}'
+                'message': f'Insufficient stock. Available: {sum(level.quantity for level in levels)}'
             }
         
+        if not SalesService._take_stock(allocations):
+            db.session.rollback()
+            return {'success': False, 'message': 'Stock changed during checkout, please retry'}
+        
         # Create sale record
         total_amount = product.price * quantity
         sale = Sale(
@@ -101,30 +346,143 @@ class SalesService:
             total_amount=total_amount
         )
         
-        # Update product quantity
-        product.quantity -= quantity
-        
         db.session.add(sale)
         db.session.commit()
+        bump_catalog_version()
         
         logger.info(f"Sale created: {quantity} x {product.name} = ${total_amount}")
         
         return {
             'success': True,
             'sale': sale.to_dict(),
+            'allocations': [
+                {'location_id': level.location_id, 'location': level.location.name, 'quantity': take}
+                for level, take in allocations
+            ],
             'message': 'Sale completed successfully'
         }
     
     @staticmethod
-    def get_sales_by_user(user_id: int) -> List[Sale]:
-        """Get all sales for a user."""
-        return Sale.query.filter_by(user_id=user_id).all()
+    def _allocate_available(product_id: int, quantity: int, location_id: int = None) -> tuple:
+        """Get a product's stocked levels and an allocation of ``quantity`` from them.
+        
+        If the stock is short, a few of this product's lapsed reservations are
+        returned in the same transaction and the allocation is retried once.
+        The allocation is ``None`` if still short.
+        """
+        def load():
+            levels = StockLevel.query.filter(
+                StockLevel.product_id == product_id,
+                StockLevel.quantity > 0
+            )
+            if location_id is not None:
+                levels = levels.filter(StockLevel.location_id == location_id)
+            levels = levels.order_by(StockLevel.quantity.desc()).populate_existing().all()
+            return levels, SalesService._allocate(levels, quantity)
+        
+        levels, allocations = load()
+        if allocations is None and ReservationService._expire_due(
+                datetime.utcnow(), ReservationService.CHECKOUT_EXPIRY_LIMIT, product_id)[1]:
+            levels, allocations = load()
+            if allocations is None:
+                # Still short: leave the lapsed holds to the expiry job
+                db.session.rollback()
+        return levels, allocations
+    
+    @staticmethod
+    def _take_stock(allocations: List[tuple]) -> bool:
+        """Remove allocated units from stock, without committing.
+        
+        Conditional decrements touch only the allocated location rows and
+        fail instead of overselling if another checkout got there first.
+        """
+        for level, take in allocations:
+            taken = db.session.execute(
+                update(StockLevel).where(
+                    StockLevel.id == level.id,
+                    StockLevel.quantity >= take
+                ).values(quantity=StockLevel.quantity - take)
+            ).rowcount
+            if not taken:
+                return False
+        return True
+    
+    @staticmethod
+    def _allocate(levels: List[StockLevel], quantity: int) -> Optional[List[tuple]]:
+        """Plan (level, quantity) picks from levels sorted by stock, largest first.
+        
+        Returns None when the levels together cannot cover the quantity.
+        """
+        if levels and levels[0].quantity >= quantity:
+            return [(levels[0], quantity)]
+        
+        allocations = []
+        remaining = quantity
+        for level in levels:
+            if remaining <= 0:
+                break
+            take = min(level.quantity, remaining)
+            allocations.append((level, take))
+            remaining -= take
+        
+        return allocations if remaining <= 0 else None
+    
+    @staticmethod
+    def _archive() -> SalesArchive:
+        """Get the sales archive for the current app."""
+        return SalesArchive(current_app.config['SALES_ARCHIVE_DIR'])
+    
+    @staticmethod
+    def _sale_records(statement) -> List[SaleRecord]:
+        return [SaleRecord._make(row) for row in read_session().execute(statement)]
+    
+    @staticmethod
+    def _union(hot: List[SaleRecord], archived: List[ArchivedSale]) -> List[SaleRecord]:
+        """Combine archived and hot sales, oldest first.
+        
+        Rows present in both (archived but not yet deleted) come from the hot table.
+        """
+        hot_ids = {sale.id for sale in hot}
+        return [
+            SaleRecord(sale.id, sale.user, sale.product, sale.quantity,
+                       sale.unit_price, sale.total_amount, sale.sale_date)
+            for sale in archived if sale.id not in hot_ids
+        ] + hot
+    
+    @staticmethod
+    def get_sales_by_user(user_id: int, limit: int = None) -> List[SaleRecord]:
+        """Get sales for a user, including archived ones, oldest first.
+        
+        With ``limit`` only the most recent sales are returned, and the
+        archive is read only if the hot table has fewer than that.
+        """
+        statement = sale_record_joins(select(*SALE_COLUMNS)).where(Sale.user_id == user_id)
+        if limit is None:
+            sales = SalesService._sale_records(statement.order_by(Sale.id))
+            return SalesService._union(sales, SalesService._archive().read(user_id=user_id))
+        
+        sales = SalesService._sale_records(statement.order_by(
+            Sale.sale_date.desc(), Sale.id.desc()
+        ).limit(limit))[::-1]
+        if len(sales) < limit:
+            archived = SalesService._archive().read(user_id=user_id)
+            sales = SalesService._union(sales, archived)[-limit:]
+        return sales
+    
+    @staticmethod
+    def get_sales_in_range(start_date: datetime, end_date: datetime = None) -> List[SaleRecord]:
+        """Get sales in ``[start_date, end_date)``, reading only overlapping archive partitions."""
+        statement = sale_record_joins(select(*SALE_COLUMNS)).where(Sale.sale_date >= start_date)
+        if end_date is not None:
+            statement = statement.where(Sale.sale_date < end_date)
+        archived = SalesService._archive().read(start_date, end_date)
+        return SalesService._union(SalesService._sale_records(statement.order_by(Sale.id)), archived)
     
     @staticmethod
     def get_sales_report(days: int = 30) -> Dict[str, Any]:
         """Generate sales report for specified days."""
         start_date = datetime.utcnow() - timedelta(days=days)
-        sales = Sale.query.filter(Sale.sale_date >= start_date).all()
+        sales = SalesService.get_sales_in_range(start_date)
         
         total_revenue = sum(sale.total_amount for sale in sales)
         total_transactions = len(sales)
@@ -136,6 +494,359 @@ class SalesService:
             'sales': [sale.to_dict() for sale in sales]
         }
 
+    @staticmethod
+    def get_sales_summary(days: int = 30, recent: int = 10) -> Dict[str, Any]:
+        """Sales report totals plus only the most recent sales, oldest first.
+        
+        Totals are aggregated in SQL and from the archive's amount column,
+        so no sale rows are loaded beyond the ``recent`` ones shown. Like
+        ``_union``, sales present in both (archived but not yet deleted)
+        are counted from the hot table only.
+        """
+        start_date = datetime.utcnow() - timedelta(days=days)
+        count, revenue = read_session().query(
+            func.count(Sale.id), func.coalesce(func.sum(Sale.total_amount), 0.0)
+        ).filter(Sale.sale_date >= start_date).one()
+        
+        archive = SalesService._archive()
+        archived_count, archived_revenue = 0, 0.0
+        newest = archive.newest_date()
+        if newest is not None and newest >= start_date:
+            # Only hot rows no newer than the archive can also be in it
+            overlap = {sale_id for (sale_id,) in read_session().query(Sale.id).filter(
+                Sale.sale_date >= start_date,
+                Sale.sale_date <= newest
+            )}
+            archived_count, archived_revenue = archive.totals(start_date, exclude_ids=overlap)
+        
+        recent_sales = SalesService._sale_records(
+            sale_record_joins(select(*SALE_COLUMNS)).where(Sale.sale_date >= start_date).order_by(
+                Sale.sale_date.desc(), Sale.id.desc()
+            ).limit(recent)
+        )[::-1]
+        if len(recent_sales) < recent and archived_count:
+            archived = archive.read(start_date)
+            recent_sales = SalesService._union(recent_sales, archived)[-recent:]
+        
+        return {
+            'period_days': days,
+            'total_revenue': revenue + archived_revenue,
+            'total_transactions': count + archived_count,
+            'recent_sales': [sale.to_dict() for sale in recent_sales]
+        }
+    
+    @staticmethod
+    def archive_old_sales(days: int = None, batch_size: int = 1000) -> Dict[str, Any]:
+        """Move sales older than the retention period into the archive.
+        
+        Sales are read in batches and collected a month at a time, so each
+        partition is written once per run. A month is read back and verified
+        before its rows are deleted, so an interrupted run can simply be
+        repeated.
+        """
+        if days is None:
+            days = current_app.config['SALES_RETENTION_DAYS']
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        archive = SalesService._archive()
+        
+        archived = 0
+        partitions = set()
+        month, rows = None, []
+        last = None
+        while True:
+            query = Sale.query.options(
+                joinedload(Sale.user), joinedload(Sale.product)
+            ).filter(Sale.sale_date < cutoff)
+            if last is not None:
+                # Rows stay in the table until their month is written, so page by key
+                query = query.filter(or_(
+                    Sale.sale_date > last[0],
+                    and_(Sale.sale_date == last[0], Sale.id > last[1])
+                ))
+            batch = query.order_by(Sale.sale_date, Sale.id).limit(batch_size).all()
+            if batch:
+                last = (batch[-1].sale_date, batch[-1].id)
+            
+            done = len(batch) < batch_size
+            finished = []
+            for sale in batch:
+                key = archive.partition_key(sale.sale_date)
+                if rows and key != month:
+                    finished.append((month, rows))
+                    rows = []
+                month = key
+                rows.append(ArchivedSale(
+                    id=sale.id,
+                    user_id=sale.user_id,
+                    product_id=sale.product_id,
+                    quantity=sale.quantity,
+                    unit_price=sale.unit_price,
+                    total_amount=sale.total_amount,
+                    sale_date=sale.sale_date,
+                    user=sale.user.username if sale.user else '',
+                    product=sale.product.name if sale.product else ''
+                ))
+            if done and rows:
+                finished.append((month, rows))
+            
+            for key, month_rows in finished:
+                if not SalesService._archive_month(archive, key, month_rows, batch_size):
+                    return {
+                        'success': False,
+                        'archived': archived,
+                        'partitions': sorted(partitions),
+                        'message': f'Verification failed for partition {key}'
+                    }
+                archived += len(month_rows)
+                partitions.add(key)
+            
+            if done:
+                break
+        
+        logger.info(f"Archived {archived} sales older than {days} days")
+        return {
+            'success': True,
+            'archived': archived,
+            'partitions': sorted(partitions),
+            'message': f'Archived {archived} sales'
+        }
+    
+    @staticmethod
+    def _archive_month(archive: SalesArchive, key: str, rows: List[ArchivedSale],
+                       batch_size: int) -> bool:
+        """Write one month's sales to its partition, verify it, then delete them."""
+        archive.write_partition(key, rows)
+        ids = [row.id for row in rows]
+        if not archive.verify(key) or not set(ids) <= archive.ids(key):
+            db.session.rollback()
+            logger.error(f"Archive verification failed for partition {key}")
+            return False
+        
+        for i in range(0, len(ids), batch_size):
+            Sale.query.filter(Sale.id.in_(ids[i:i + batch_size])).delete(synchronize_session=False)
+        db.session.commit()
+        return True
+
+class ReservationService:
+    """Service class for checkout stock holds.
+    
+    A hold moves units out of the available stock levels straight away, so
+    ``Product.quantity`` always means stock that can still be sold or held.
+    Each step is one short transaction; nothing stays open while the
+    customer checks out.
+    """
+    
+    # Lapsed holds a short checkout may reclaim; the expiry job does the rest
+    CHECKOUT_EXPIRY_LIMIT = 20
+    
+    @staticmethod
+    def reserve(user_id: int, product_id: int, quantity: int, location_id: int = None,
+                ttl: int = None) -> Dict[str, Any]:
+        """Hold stock for a checkout for ``ttl`` seconds.
+        
+        Stock is allocated like a sale. The hold lapses unless it is
+        confirmed before it expires.
+        """
+        if quantity <= 0:
+            return {'success': False, 'message': 'Quantity must be positive'}
+        product = Product.query.get(product_id)
+        if not product:
+            return {'success': False, 'message': 'Product not found'}
+        
+        levels, allocations = SalesService._allocate_available(product_id, quantity, location_id)
+        if allocations is None:
+            return {
+                'success': False,
+                'message': f'Insufficient stock. Available: {sum(level.quantity for level in levels)}'
+            }
+        
+        if not SalesService._take_stock(allocations):
+            db.session.rollback()
+            return {'success': False, 'message': 'Stock changed during checkout, please retry'}
+        
+        ttl = ttl or current_app.config['RESERVATION_TTL']
+        reservation = Reservation(
+            user_id=user_id,
+            product_id=product_id,
+            quantity=quantity,
+            unit_price=product.price,
+            allocations=json.dumps([[level.location_id, take] for level, take in allocations]),
+            expires_at=datetime.utcnow() + timedelta(seconds=ttl)
+        )
+        db.session.add(reservation)
+        db.session.commit()
+        bump_catalog_version()
+        
+        logger.info(f"Reserved {quantity} x {product.name} until {reservation.expires_at}")
+        return {'success': True, 'reservation': reservation.to_dict(), 'message': 'Stock reserved'}
+    
+    @staticmethod
+    def _claim(reservation_id: int, user_id: int, status: str, unexpired: bool = False) -> Optional[Reservation]:
+        """Move a user's active hold to ``status``, or return ``None``.
+        
+        The conditional update means a hold is confirmed, released or
+        expired exactly once, however those race.
+        """
+        conditions = [
+            Reservation.id == reservation_id,
+            Reservation.user_id == user_id,
+            Reservation.status == 'active'
+        ]
+        if unexpired:
+            conditions.append(Reservation.expires_at > datetime.utcnow())
+        claimed = db.session.execute(
+            update(Reservation).where(*conditions).values(status=status)
+        ).rowcount
+        if not claimed:
+            db.session.rollback()
+            return None
+        return Reservation.query.get(reservation_id)
+    
+    @staticmethod
+    def _unavailable(reservation_id: int, user_id: int) -> Dict[str, Any]:
+        reservation = Reservation.query.get(reservation_id)
+        if not reservation or reservation.user_id != user_id:
+            return {'success': False, 'message': 'Reservation not found'}
+        if reservation.status == 'active':
+            return {'success': False, 'message': 'Reservation has expired'}
+        return {'success': False, 'message': f'Reservation is already {reservation.status}'}
+    
+    @staticmethod
+    def confirm(reservation_id: int, user_id: int) -> Dict[str, Any]:
+        """Turn an unexpired hold into a sale at the held price."""
+        reservation = ReservationService._claim(reservation_id, user_id, 'confirmed', unexpired=True)
+        if not reservation:
+            return ReservationService._unavailable(reservation_id, user_id)
+        
+        # The held units already left stock when the hold was placed
+        sale = Sale(
+            user_id=user_id,
+            product_id=reservation.product_id,
+            quantity=reservation.quantity,
+            unit_price=reservation.unit_price,
+            total_amount=reservation.unit_price * reservation.quantity
+        )
+        db.session.add(sale)
+        db.session.commit()
+        # Cached product tables show the held count
+        bump_catalog_version()
+        
+        logger.info(f"Reservation {reservation_id} confirmed as sale {sale.id}")
+        return {'success': True, 'sale': sale.to_dict(), 'message': 'Sale completed successfully'}
+    
+    @staticmethod
+    def release(reservation_id: int, user_id: int) -> Dict[str, Any]:
+        """Cancel an active hold and return its units to stock."""
+        reservation = ReservationService._claim(reservation_id, user_id, 'released')
+        if not reservation:
+            return ReservationService._unavailable(reservation_id, user_id)
+        
+        ReservationService._return_stock([(reservation.product_id, reservation.allocations)])
+        db.session.commit()
+        bump_catalog_version()
+        
+        logger.info(f"Reservation {reservation_id} released")
+        return {'success': True, 'message': 'Reservation released'}
+    
+    @staticmethod
+    def _return_stock(holds: List[tuple]) -> None:
+        """Put held units back, one update per location row.
+        
+        ``holds`` are ``(product_id, allocations JSON)`` pairs. Does not commit.
+        """
+        by_level = {}
+        for product_id, allocations in holds:
+            for location_id, quantity in json.loads(allocations):
+                key = (product_id, location_id)
+                by_level[key] = by_level.get(key, 0) + quantity
+        
+        for (product_id, location_id), quantity in by_level.items():
+            db.session.execute(
+                update(StockLevel).where(
+                    StockLevel.product_id == product_id,
+                    StockLevel.location_id == location_id
+                ).values(quantity=StockLevel.quantity + quantity)
+            )
+    
+    @staticmethod
+    def expire_reservations(now: datetime = None, batch_size: int = 500) -> int:
+        """Return the stock of every lapsed hold; returns how many expired.
+        
+        Lapsed holds are found through the (status, expires_at) index in
+        due order, and each batch is expired in one short transaction.
+        """
+        now = now or datetime.utcnow()
+        expired = 0
+        while True:
+            found, claimed = ReservationService._expire_due(now, batch_size)
+            db.session.commit()
+            expired += claimed
+            if found < batch_size:
+                break
+        
+        if expired:
+            bump_catalog_version()
+            logger.info(f"Expired {expired} reservations")
+        return expired
+    
+    @staticmethod
+    def _expire_due(now: datetime, limit: int, product_id: int = None) -> tuple:
+        """Expire up to ``limit`` lapsed holds, without committing.
+        
+        Returns how many lapsed holds were found and how many this call
+        expired; holds confirmed or released since they were read are skipped.
+        """
+        due = db.session.query(
+            Reservation.id, Reservation.product_id, Reservation.allocations
+        ).filter(
+            Reservation.status == 'active',
+            Reservation.expires_at <= now
+        )
+        if product_id is not None:
+            due = due.filter(Reservation.product_id == product_id)
+        due = due.order_by(Reservation.expires_at).limit(limit).all()
+        
+        holds = []
+        for reservation_id, hold_product_id, allocations in due:
+            claimed = db.session.execute(
+                update(Reservation).where(
+                    Reservation.id == reservation_id,
+                    Reservation.status == 'active'
+                ).values(status='expired')
+            ).rowcount
+            if claimed:
+                holds.append((hold_product_id, allocations))
+        
+        ReservationService._return_stock(holds)
+        return len(due), len(holds)
+    
+    @staticmethod
+    def get_held_quantities(product_ids: List[int]) -> Dict[int, int]:
+        """Get units held by unexpired reservations for each given product.
+        
+        Reads the primary, like ``InventoryService.get_products_page``, since
+        the counts are cached with the product table by catalog version.
+        """
+        if not product_ids:
+            return {}
+        rows = db.session.query(
+            Reservation.product_id, func.sum(Reservation.quantity)
+        ).filter(
+            Reservation.product_id.in_(product_ids),
+            Reservation.status == 'active',
+            Reservation.expires_at > datetime.utcnow()
+        ).group_by(Reservation.product_id).all()
+        return dict(rows)
+    
+    @staticmethod
+    def get_user_reservations(user_id: int) -> List[Reservation]:
+        """Get a user's unexpired holds, soonest to expire first."""
+        return Reservation.query.filter(
+            Reservation.user_id == user_id,
+            Reservation.status == 'active',
+            Reservation.expires_at > datetime.utcnow()
+        ).order_by(Reservation.expires_at).all()
+
 class UserService:
     """Service class for user operations."""
     
@@ -155,4 +866,97 @@ class UserService:
         user = User.query.filter_by(username=username).first()
         if user and user.check_password(password):
             return user
-        return None
\ No newline at end of file
+        return None
+
+class JobService:
+    """Service class for background job status and results."""
+    
+    @staticmethod
+    def get_jobs() -> List[Job]:
+        """Get all scheduled jobs."""
+        return Job.query.order_by(Job.name).all()
+    
+    @staticmethod
+    def get_recent_runs(limit: int = 50) -> List[JobRun]:
+        """Get the most recent job runs, newest first."""
+        return JobRun.query.order_by(JobRun.id.desc()).limit(limit).all()
+    
+    @staticmethod
+    def get_latest_result(job_name: str, max_age: int = None) -> Optional[Dict[str, Any]]:
+        """Get the result of a job's last successful run, if recent enough."""
+        query = JobRun.query.filter(
+            JobRun.job_name == job_name,
+            JobRun.status == 'success',
+            JobRun.result.isnot(None)
+        )
+        if max_age is not None:
+            query = query.filter(JobRun.finished_at >= datetime.utcnow() - timedelta(seconds=max_age))
+        
+        run = query.order_by(JobRun.id.desc()).first()
+        if not run:
+            return None
+        return {'result': json.loads(run.result), 'finished_at': run.finished_at}
+
+class AsyncInventoryService:
+    """Async read-only inventory queries for the ASGI API."""
+    
+    @staticmethod
+    async def get_all_products(session: AsyncSession) -> List[ProductRecord]:
+        """Get all products."""
+        result = await session.execute(select(*PRODUCT_COLUMNS).order_by(Product.id))
+        return [ProductRecord._make(row) for row in result]
+    
+    @staticmethod
+    async def search_products(session: AsyncSession, query: str) -> List[ProductRecord]:
+        """Search products by name or category."""
+        result = await session.execute(select(*PRODUCT_COLUMNS).where(
+            Product.name.contains(query) | Product.category.contains(query)
+        ).order_by(Product.id))
+        return [ProductRecord._make(row) for row in result]
+
+class AsyncSalesService:
+    """Async read-only sales queries for the ASGI API."""
+    
+    @staticmethod
+    async def get_sales_by_user(session: AsyncSession, user_id: int,
+                                archive: SalesArchive = None, limit: int = None) -> List[SaleRecord]:
+        """Get sales for a user, including archived ones, oldest first.
+        
+        With ``limit`` only the most recent sales are returned, and the
+        archive is read only if the hot table has fewer than that.
+        """
+        statement = sale_record_joins(select(*SALE_COLUMNS)).where(Sale.user_id == user_id)
+        if limit is None:
+            statement = statement.order_by(Sale.id)
+        else:
+            statement = statement.order_by(Sale.sale_date.desc(), Sale.id.desc()).limit(limit)
+        result = await session.execute(statement)
+        sales = [SaleRecord._make(row) for row in result]
+        if limit is not None:
+            sales.reverse()
+        
+        if archive is None or (limit is not None and len(sales) >= limit):
+            return sales
+        archived = await asyncio.to_thread(archive.read, None, None, user_id)
+        sales = SalesService._union(sales, archived)
+        return sales if limit is None else sales[-limit:]
+    
+    @staticmethod
+    async def get_sales_report(session: AsyncSession, days: int = 30,
+                               archive: SalesArchive = None) -> Dict[str, Any]:
+        """Generate sales report for specified days."""
+        start_date = datetime.utcnow() - timedelta(days=days)
+        result = await session.execute(
+            sale_record_joins(select(*SALE_COLUMNS)).where(Sale.sale_date >= start_date).order_by(Sale.id)
+        )
+        sales = [SaleRecord._make(row) for row in result]
+        if archive is not None:
+            archived = await asyncio.to_thread(archive.read, start_date)
+            sales = SalesService._union(sales, archived)
+        
+        return {
+            'period_days': days,
+            'total_revenue': sum(sale.total_amount for sale in sales),
+            'total_transactions': len(sales),
+            'sales': [sale.to_dict() for sale in sales]
+        }
@@ -14,11 +14,17 @@ setup(
         "flask-login>=0.6.3",
         "werkzeug>=2.3.7",
         "python-dotenv>=1.0.0",
+        "starlette>=0.37.2",
+        "aiosqlite>=0.20.0",
+        "greenlet>=3.0.3",
+        "uvicorn>=0.29.0",
+        "msgpack>=1.0.8",
     ],
     extras_require={
         "dev": [
             "pytest>=7.4.2",
             "pytest-cov>=4.1.0",
+            "httpx>=0.27.0",
         ]
     },
     entry_points={
@@ -67,7 +67,7 @@ function confirmPurchase() {
 }
 
 function loadSalesHistory() {
-    fetch('/api/sales')
+    fetch('/api/sales?limit=5')
     .then(response => response.json())
     .then(sales => {
         const container = document.getElementById('sales-history');
@@ -0,0 +1,22 @@
+"""Shared test fixtures."""
+import pytest
+from models import db
+from app import create_app
+
+@pytest.fixture
+def app(tmp_path):
+    """Create test app with a temporary archive directory."""
+    app = create_app('testing')
+    app.config['SALES_ARCHIVE_DIR'] = str(tmp_path / 'archive')
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    """Create test client logged in as admin."""
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    return client
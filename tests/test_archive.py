@@ -0,0 +1,103 @@
+"""Tests for the sales archive."""
+from datetime import datetime, timedelta
+from models import db, Sale
+from services import InventoryService, SalesService, UserService
+from archive import ArchivedSale, SalesArchive
+
+def make_sales(user, product, ages):
+    """Create sales backdated by the given number of days."""
+    now = datetime.utcnow()
+    for age in ages:
+        result = SalesService.create_sale(user.id, product.id, 1)
+        sale = Sale.query.get(result['sale']['id'])
+        sale.sale_date = now - timedelta(days=age)
+    db.session.commit()
+
+def test_partition_round_trip(tmp_path):
+    """Test partitions read back what was written, filtered by date and user."""
+    archive = SalesArchive(str(tmp_path))
+    sales = [
+        ArchivedSale(id=i, user_id=i % 2, product_id=1, quantity=i, unit_price=2.5,
+                     total_amount=2.5 * i, sale_date=datetime(2024, 1, i + 1, 12),
+                     user=f'user{i % 2}', product='Pencil')
+        for i in range(1, 6)
+    ]
+    archive.write_partition('2024-01', sales[:3])
+    archive.write_partition('2024-01', sales[2:])
+    
+    assert archive.partitions() == ['2024-01']
+    assert archive.verify('2024-01')
+    assert archive.ids('2024-01') == {1, 2, 3, 4, 5}
+    assert [s.id for s in archive.read(user_id=1)] == [1, 3, 5]
+    assert [s.id for s in archive.read(datetime(2024, 1, 3), datetime(2024, 1, 5))] == [2, 3]
+    assert archive.read(datetime(2024, 2, 1)) == []
+    assert archive.read()[0].to_dict() == sales[0].to_dict()
+
+def test_archive_old_sales(app):
+    """Test old sales move to the archive and queries still see them."""
+    with app.app_context():
+        user = UserService.create_user("testuser", "test@test.com", "1234567890", "password")
+        product = InventoryService.add_product("Test Product", 10.0, 50)
+        make_sales(user, product, [400, 380, 45, 1])
+        
+        result = SalesService.archive_old_sales(days=30, batch_size=2)
+        assert result['success'] is True
+        assert result['archived'] == 3
+        assert Sale.query.count() == 1
+        
+        history = SalesService.get_sales_by_user(user.id)
+        assert len(history) == 4
+        assert history[0].to_dict()['product'] == "Test Product"
+        
+        report = SalesService.get_sales_report(60)
+        assert report['total_transactions'] == 2
+        assert report['total_revenue'] == 20.0
+        
+        # Re-running is a no-op
+        assert SalesService.archive_old_sales(days=30)['archived'] == 0
+
+def test_archive_writes_each_month_once(app, monkeypatch):
+    """Test a month spanning several batches is written in one pass."""
+    with app.app_context():
+        user = UserService.create_user("testuser", "test@test.com", "1234567890", "password")
+        product = InventoryService.add_product("Test Product", 10.0, 50)
+        make_sales(user, product, [0] * 7)
+        for day, sale in zip([1, 2, 3, 4, 5, 1, 2], Sale.query.order_by(Sale.id)):
+            sale.sale_date = datetime(2024, 1 if sale.id <= 5 else 2, day)
+        db.session.commit()
+        
+        writes = []
+        write_partition = SalesArchive.write_partition
+        monkeypatch.setattr(SalesArchive, 'write_partition',
+                            lambda self, key, rows: writes.append(key) or write_partition(self, key, rows))
+        
+        result = SalesService.archive_old_sales(days=30, batch_size=2)
+        assert result['archived'] == 7
+        assert writes == ['2024-01', '2024-02']
+        assert SalesArchive(app.config['SALES_ARCHIVE_DIR']).ids('2024-01') == {1, 2, 3, 4, 5}
+        assert Sale.query.count() == 0
+
+def test_summary_counts_unarchived_overlap_once(app):
+    """Test sales written to the archive but not yet deleted are counted once."""
+    with app.app_context():
+        user = UserService.create_user("testuser", "test@test.com", "1234567890", "password")
+        product = InventoryService.add_product("Test Product", 10.0, 50)
+        make_sales(user, product, [10] * 5)
+        
+        # An interrupted archive run: partition written, rows never deleted
+        archive = SalesArchive(app.config['SALES_ARCHIVE_DIR'])
+        by_key = {}
+        for sale in Sale.query.all():
+            by_key.setdefault(archive.partition_key(sale.sale_date), []).append(ArchivedSale(
+                id=sale.id, user_id=sale.user_id, product_id=sale.product_id,
+                quantity=sale.quantity, unit_price=sale.unit_price,
+                total_amount=sale.total_amount, sale_date=sale.sale_date,
+                user=user.username, product=product.name
+            ))
+        for key, rows in by_key.items():
+            archive.write_partition(key, rows)
+        
+        assert SalesService.get_sales_report(30)['total_transactions'] == 5
+        summary = SalesService.get_sales_summary(30)
+        assert summary['total_transactions'] == 5
+        assert summary['total_revenue'] == 50.0
@@ -0,0 +1,85 @@
+"""Tests for the async read API."""
+import pytest
+from starlette.testclient import TestClient
+from models import db
+from services import InventoryService, SalesService, UserService
+from app import create_app
+from asgi import create_asgi_app, async_database_uri
+from archive import SalesArchive
+import config
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Create test app on a file database both apps can open."""
+    monkeypatch.setattr(config.TestingConfig, 'SQLALCHEMY_DATABASE_URI',
+                        f"sqlite:///{tmp_path / 'test.db'}")
+    app = create_app('testing')
+    
+    with app.app_context():
+        user = UserService.create_user("testuser", "test@test.com", "1234567890", "password")
+        product = InventoryService.add_product("Test Product", 10.0, 50, category="Testing")
+        SalesService.create_sale(user.id, product.id, 5)
+    
+    yield app
+    
+    with app.app_context():
+        db.drop_all()
+
+def login(flask_app, username, password):
+    """Log in through Flask and return its session cookie."""
+    client = flask_app.test_client()
+    client.post('/login', data={'username': username, 'password': password})
+    return client.get_cookie(flask_app.config['SESSION_COOKIE_NAME']).value
+
+@pytest.fixture
+def asgi_client(app):
+    """Create ASGI test client."""
+    with TestClient(create_asgi_app(flask_app=app)) as client:
+        yield client
+
+def test_async_database_uri():
+    """Test sync URIs map to their async drivers."""
+    assert async_database_uri('sqlite:////tmp/x.db') == 'sqlite+aiosqlite:////tmp/x.db'
+    assert async_database_uri('postgresql://u:p@h/db') == 'postgresql+asyncpg://u:p@h/db'
+
+def test_requires_login(asgi_client):
+    """Test endpoints reject requests without a session."""
+    assert asgi_client.get('/api/products').status_code == 401
+
+def test_products_and_sales_with_flask_session(app, asgi_client):
+    """Test the Flask login cookie authenticates ASGI reads."""
+    asgi_client.cookies.set(app.config['SESSION_COOKIE_NAME'], login(app, 'testuser', 'password'))
+    
+    products = asgi_client.get('/api/products').json()
+    assert 'Test Product' in [p['name'] for p in products]
+    
+    results = asgi_client.get('/api/products/search', params={'q': 'Testing'}).json()
+    assert [p['name'] for p in results] == ['Test Product']
+    
+    sales = asgi_client.get('/api/sales').json()
+    assert len(sales) == 1
+    assert sales[0]['product'] == 'Test Product'
+    assert sales[0]['total_amount'] == 50.0
+
+def test_sales_limit_skips_archive(app, asgi_client, monkeypatch):
+    """Test a limited poll is served from the hot table alone."""
+    asgi_client.cookies.set(app.config['SESSION_COOKIE_NAME'], login(app, 'testuser', 'password'))
+    
+    def fail(*args):
+        raise AssertionError('archive read')
+    monkeypatch.setattr(SalesArchive, 'read', fail)
+    
+    sales = asgi_client.get('/api/sales', params={'limit': 1}).json()
+    assert [sale['product'] for sale in sales] == ['Test Product']
+    assert asgi_client.get('/api/sales', params={'limit': 'x'}).status_code == 400
+
+def test_report_admin_only(app, asgi_client):
+    """Test report access follows admin role."""
+    asgi_client.cookies.set(app.config['SESSION_COOKIE_NAME'], login(app, 'testuser', 'password'))
+    assert asgi_client.get('/api/admin/report').status_code == 403
+    
+    asgi_client.cookies.set(app.config['SESSION_COOKIE_NAME'], login(app, 'admin', 'admin123'))
+    report = asgi_client.get('/api/admin/report', params={'days': 7}).json()
+    assert report['period_days'] == 7
+    assert report['total_transactions'] == 1
+    assert report['total_revenue'] == 50.0
@@ -0,0 +1,56 @@
+"""Tests for bulk API response formats."""
+import gzip
+import msgpack
+from services import SalesService
+from formats import COLUMNAR_MIMETYPE, MSGPACK_MIMETYPE
+
+def test_json_matches_to_dict(app, client):
+    """Test the default format keeps the object-per-row shape."""
+    products = client.get('/api/products').json
+    assert products[0] == {
+        'id': 1, 'name': 'Pencil', 'price': 2.0, 'quantity': 90,
+        'description': 'Writing instrument', 'category': 'Stationery'
+    }
+
+def test_columnar_and_msgpack(app, client):
+    """Test columnar JSON and MessagePack share one array per field."""
+    response = client.get('/api/products', headers={'Accept': COLUMNAR_MIMETYPE})
+    assert response.mimetype == COLUMNAR_MIMETYPE
+    columnar = response.json
+    assert columnar['count'] == 7
+    assert columnar['columns']['name'][:2] == ['Pencil', 'Eraser']
+    
+    response = client.get('/api/products', headers={'Accept': MSGPACK_MIMETYPE})
+    assert response.mimetype == MSGPACK_MIMETYPE
+    assert msgpack.unpackb(response.data) == columnar
+    
+    assert client.get('/api/products?format=msgpack').mimetype == MSGPACK_MIMETYPE
+
+def test_sales_and_report_rows(app, client):
+    """Test sale rows carry names and ISO dates in every format."""
+    with app.app_context():
+        SalesService.create_sale(1, 1, 2)
+        expected = SalesService.get_sales_by_user(1)[0].to_dict()
+    
+    assert client.get('/api/sales').json == [expected]
+    
+    report = client.get('/api/admin/report?format=columnar').json
+    assert report['total_transactions'] == 1
+    assert report['total_revenue'] == 4.0
+    assert report['sales']['columns']['sale_date'] == [expected['sale_date']]
+
+def test_large_responses_compressed(app, client):
+    """Test gzip and deflate are applied above the size threshold."""
+    app.config['COMPRESS_MIN_SIZE'] = 100
+    
+    response = client.get('/api/products', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data).startswith(b'[{')
+    
+    response = client.get('/api/products', headers={'Accept-Encoding': 'deflate'})
+    assert response.headers['Content-Encoding'] == 'deflate'
+    
+    app.config['COMPRESS_MIN_SIZE'] = 1 << 20
+    assert 'Content-Encoding' not in client.get(
+        '/api/products', headers={'Accept-Encoding': 'gzip'}
+    ).headers
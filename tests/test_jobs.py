@@ -0,0 +1,62 @@
+"""Tests for the background job scheduler."""
+import pytest
+from datetime import datetime, timedelta
+from models import db, Job, JobRun
+from services import JobService, SalesService
+from jobs import JOBS, CronSchedule, JobDefinition, Scheduler
+
+def test_cron_next_after():
+    """Test cron schedules find the next matching minute."""
+    now = datetime(2024, 1, 1, 10, 7, 30)  # a Monday
+    assert CronSchedule('*/15 * * * *').next_after(now) == datetime(2024, 1, 1, 10, 15)
+    assert CronSchedule('0 2 * * *').next_after(now) == datetime(2024, 1, 2, 2, 0)
+    assert CronSchedule('0 3 * * 0').next_after(now) == datetime(2024, 1, 7, 3, 0)
+    assert CronSchedule('30 9 1,15 * *').next_after(now) == datetime(2024, 1, 15, 9, 30)
+    with pytest.raises(ValueError):
+        CronSchedule('61 * * * *')
+
+def test_due_job_runs_once_and_reschedules(app):
+    """Test a due job runs, records its result and moves to the next slot."""
+    scheduler = Scheduler(app)
+    later = datetime.utcnow() + timedelta(minutes=20)
+    
+    assert scheduler.run_pending(later) >= 1
+    assert scheduler.run_pending(later) == 0
+    
+    job = Job.query.filter_by(name='sales_report').one()
+    assert job.next_run_at > later
+    
+    latest = JobService.get_latest_result('sales_report')
+    assert latest['result']['total_transactions'] == 0
+
+def test_failed_job_retries_with_backoff(app, monkeypatch):
+    """Test failures are recorded and retried until retries run out."""
+    def broken():
+        raise RuntimeError('boom')
+    monkeypatch.setitem(JOBS, 'broken', JobDefinition(broken, '0 0 1 1 *', 1, 60))
+    scheduler = Scheduler(app)
+    
+    first = scheduler.run_job('broken')
+    assert first['status'] == 'failed'
+    assert 'boom' in first['error']
+    job = Job.query.filter_by(name='broken').one()
+    assert job.attempt == 1
+    assert job.next_run_at < datetime.utcnow() + timedelta(minutes=2)
+    
+    scheduler.run_pending(job.next_run_at)
+    db.session.expire_all()
+    job = Job.query.filter_by(name='broken').one()
+    assert job.attempt == 0
+    assert job.next_run_at.month == 1 and job.next_run_at.day == 1
+    assert JobRun.query.filter_by(job_name='broken', status='failed').count() == 2
+
+def test_admin_reads_precomputed_report(app):
+    """Test the admin page shows the scheduled report instead of recomputing."""
+    Scheduler(app).run_job('sales_report')
+    SalesService.create_sale(1, 1, 1)
+    
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    html = client.get('/admin').get_data(as_text=True)
+    assert 'As of' in html
+    assert '<strong>Total Transactions:</strong> 0' in html
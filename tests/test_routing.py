@@ -0,0 +1,68 @@
+"""Tests for read replica routing."""
+import pytest
+from models import db
+from services import InventoryService, SalesService
+from routing import read_session, sync_sqlite_replicas
+from app import create_app
+import config
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Create test app with a simulated SQLite replica."""
+    monkeypatch.setattr(config.TestingConfig, 'REPLICA_DATABASE_URIS', ['sqlite:///:memory:'])
+    app = create_app('testing')
+    app.config['SALES_ARCHIVE_DIR'] = str(tmp_path / 'archive')
+    
+    with app.app_context():
+        sync_sqlite_replicas()
+    yield app
+
+def product_names():
+    return {product.name for product in InventoryService.get_all_products()}
+
+def test_no_replicas_uses_primary():
+    """Test reads use the primary session without replicas."""
+    app = create_app('testing')
+    with app.app_context():
+        assert read_session() is db.session
+
+def test_reads_lag_until_sync(app):
+    """Test replica reads see writes only after the replica syncs."""
+    with app.app_context():
+        InventoryService.add_product("New Product", 10.0, 50)
+        # Read-your-writes within the same context
+        assert "New Product" in product_names()
+    
+    with app.app_context():
+        assert read_session() is not db.session
+        assert "New Product" not in product_names()
+        assert "Pencil" in product_names()
+    
+    with app.app_context():
+        sync_sqlite_replicas()
+        assert "New Product" in product_names()
+
+def test_requests_read_own_writes(app):
+    """Test a user's reads stick to the primary right after a purchase."""
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    
+    result = client.post('/api/purchase', json={'product_id': 1, 'quantity': 2}).json
+    assert result['success'] is True
+    assert [sale['id'] for sale in client.get('/api/sales').json] == [result['sale']['id']]
+    
+    # Another user's session still reads the lagging replica
+    other = app.test_client()
+    other.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    assert other.get('/api/sales').json == []
+    with app.app_context():
+        assert SalesService.get_sales_report()['total_transactions'] == 0
+
+def test_dashboard_reads_primary(app):
+    """Test the version-cached dashboard table never renders a lagging replica."""
+    with app.app_context():
+        InventoryService.add_product("New Product", 10.0, 50)
+    
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    assert "New Product" in client.get('/dashboard').get_data(as_text=True)
@@ -1,8 +1,10 @@
 """Unit tests for service layer."""
 import pytest
-from models import db, Product, User, Sale
-from services import InventoryService, SalesService, UserService
+from models import db, Product, User, Sale, Reservation
+from services import InventoryService, LocationService, ReservationService, SalesService, UserService
+from read_models import ProductRecord, SaleRecord
 from app import create_app
+from datetime import datetime, timedelta
 
 @pytest.fixture
 def app():
@@ -56,6 +58,19 @@ class TestInventoryService:
             assert len(low_stock) == 1
             assert low_stock[0].name == "Low Stock"
 
+    def test_listings_return_records(self, app):
+        """Test read paths load plain records, not tracked ORM instances."""
+        with app.app_context():
+            InventoryService.add_product("Test Product", 10.0, 50, category="Testing")
+            db.session.expunge_all()
+            
+            products = InventoryService.get_all_products()
+            assert all(isinstance(product, ProductRecord) for product in products)
+            assert len(db.session.identity_map) == 0
+            
+            found = InventoryService.search_products("Testing")
+            assert found[0].to_dict() == InventoryService.get_product_by_id(found[0].id).to_dict()
+
 class TestSalesService:
     """Test sales service methods."""
     
@@ -73,6 +88,10 @@ class TestSalesService:
             assert result['sale']['quantity'] == 5
             assert result['sale']['total_amount'] == 50.0
             
+            sales = SalesService.get_sales_by_user(user.id)
+            assert isinstance(sales[0], SaleRecord)
+            assert sales[0].to_dict() == result['sale']
+            
             # Check product quantity updated
             updated_product = InventoryService.get_product_by_id(product.id)
             assert updated_product.quantity == 45
@@ -88,6 +107,173 @@ class TestSalesService:
             assert result['success'] is False
             assert 'Insufficient stock' in result['message']
 
+class TestLocationService:
+    """Test multi-location stock methods."""
+    
+    def test_add_product_stocks_default_location(self, app):
+        """Test new products are stocked at the default location."""
+        with app.app_context():
+            product = InventoryService.add_product("Test Product", 10.0, 50)
+            levels = LocationService.get_stock_levels(product.id)
+            assert [(level.location.name, level.quantity) for level in levels] == [
+                (LocationService.DEFAULT_LOCATION_NAME, 50)
+            ]
+    
+    def test_sale_allocates_best_location(self, app):
+        """Test sales take stock from one location when possible."""
+        with app.app_context():
+            user = UserService.create_user("testuser", "test@test.com", "1234567890", "password")
+            store = LocationService.create_location("Store")
+            product = InventoryService.add_product("Test Product", 10.0, 5)
+            LocationService.adjust_stock(product.id, store.id, 20)
+            
+            result = SalesService.create_sale(user.id, product.id, 8)
+            assert result['allocations'] == [
+                {'location_id': store.id, 'location': 'Store', 'quantity': 8}
+            ]
+            
+            result = SalesService.create_sale(user.id, product.id, 15)
+            assert result['success'] is True
+            assert sorted(a['quantity'] for a in result['allocations']) == [3, 12]
+            
+            assert InventoryService.get_product_by_id(product.id).quantity == 2
+            assert sum(level.quantity for level in LocationService.get_stock_levels(product.id)) == 2
+    
+    def test_sale_at_location_insufficient_stock(self, app):
+        """Test a location-specific sale only counts that location's stock."""
+        with app.app_context():
+            user = UserService.create_user("testuser", "test@test.com", "1234567890", "password")
+            store = LocationService.create_location("Store")
+            product = InventoryService.add_product("Test Product", 10.0, 50)
+            LocationService.adjust_stock(product.id, store.id, 3)
+            
+            result = SalesService.create_sale(user.id, product.id, 5, location_id=store.id)
+            assert result['success'] is False
+            assert 'Available: 3' in result['message']
+    
+    def test_update_quantity_spans_locations(self, app):
+        """Test a total correction removes stock held away from the default location."""
+        with app.app_context():
+            store = LocationService.create_location("Store")
+            product = InventoryService.add_product("Test Product", 10.0, 5)
+            LocationService.adjust_stock(product.id, store.id, 20)
+            
+            assert InventoryService.update_product(product.id, quantity=12).quantity == 12
+            levels = [level.quantity for level in LocationService.get_stock_levels(product.id)]
+            assert levels == [0, 12]
+            
+            assert InventoryService.update_product(product.id, quantity=0).quantity == 0
+            with pytest.raises(ValueError):
+                InventoryService.update_product(product.id, quantity=-1)
+    
+    def test_transfer_stock(self, app):
+        """Test transfers move stock and keep the product total."""
+        with app.app_context():
+            main = LocationService.get_default_location()
+            store = LocationService.create_location("Store")
+            product = InventoryService.add_product("Test Product", 10.0, 50)
+            
+            result = LocationService.transfer_stock(product.id, main.id, store.id, 20)
+            assert result['success'] is True
+            assert LocationService.transfer_stock(product.id, main.id, store.id, 40)['success'] is False
+            
+            levels = {level.location_id: level.quantity for level in LocationService.get_stock_levels(product.id)}
+            assert levels == {main.id: 30, store.id: 20}
+            assert InventoryService.get_product_by_id(product.id).quantity == 50
+            
+            low = InventoryService.get_low_stock_products(25, location_id=store.id)
+            assert [(p.name, p.quantity) for p in low] == [("Test Product", 20)]
+
+class TestReservationService:
+    """Test checkout hold methods."""
+    
+    def test_reserve_and_confirm(self, app):
+        """Test holds leave available stock and confirm at the held price."""
+        with app.app_context():
+            user = UserService.create_user("testuser", "test@test.com", "1234567890", "password")
+            product = InventoryService.add_product("Test Product", 10.0, 10)
+            
+            result = ReservationService.reserve(user.id, product.id, 6)
+            assert result['success'] is True
+            assert InventoryService.get_product_by_id(product.id).quantity == 4
+            assert ReservationService.get_held_quantities([product.id]) == {product.id: 6}
+            
+            # Held units cannot be bought or held by anyone else
+            assert 'Available: 4' in SalesService.create_sale(user.id, product.id, 5)['message']
+            
+            InventoryService.update_product(product.id, price=12.0)
+            reservation_id = result['reservation']['id']
+            result = ReservationService.confirm(reservation_id, user.id)
+            assert result['success'] is True
+            assert result['sale']['total_amount'] == 60.0
+            assert InventoryService.get_product_by_id(product.id).quantity == 4
+            assert ReservationService.get_held_quantities([product.id]) == {}
+            assert ReservationService.confirm(reservation_id, user.id)['success'] is False
+    
+    def test_release_returns_stock(self, app):
+        """Test releasing a hold puts its units back at their locations."""
+        with app.app_context():
+            user = UserService.create_user("testuser", "test@test.com", "1234567890", "password")
+            store = LocationService.create_location("Store")
+            product = InventoryService.add_product("Test Product", 10.0, 5)
+            LocationService.adjust_stock(product.id, store.id, 5)
+            
+            reservation_id = ReservationService.reserve(user.id, product.id, 8)['reservation']['id']
+            assert sum(level.quantity for level in LocationService.get_stock_levels(product.id)) == 2
+            
+            assert ReservationService.release(reservation_id, user.id + 1)['success'] is False
+            assert ReservationService.release(reservation_id, user.id)['success'] is True
+            assert ReservationService.release(reservation_id, user.id)['success'] is False
+            
+            levels = [level.quantity for level in LocationService.get_stock_levels(product.id)]
+            assert levels == [5, 5]
+            assert InventoryService.get_product_by_id(product.id).quantity == 10
+    
+    def test_expire_reservations(self, app):
+        """Test lapsed holds are expired in bulk and cannot be confirmed."""
+        with app.app_context():
+            user = UserService.create_user("testuser", "test@test.com", "1234567890", "password")
+            product = InventoryService.add_product("Test Product", 10.0, 10)
+            
+            lapsed = [ReservationService.reserve(user.id, product.id, 2, ttl=60)['reservation']['id']
+                      for _ in range(3)]
+            ReservationService.reserve(user.id, product.id, 1, ttl=3600)
+            assert InventoryService.get_product_by_id(product.id).quantity == 3
+            
+            # Lapsed but not yet swept holds are no longer listed or counted
+            for reservation in Reservation.query.filter(Reservation.id.in_(lapsed)):
+                reservation.expires_at = datetime.utcnow() - timedelta(seconds=1)
+            db.session.commit()
+            assert len(ReservationService.get_user_reservations(user.id)) == 1
+            assert ReservationService.get_held_quantities([product.id]) == {product.id: 1}
+            
+            later = datetime.utcnow() + timedelta(minutes=5)
+            assert ReservationService.expire_reservations(later, batch_size=2) == 3
+            assert ReservationService.expire_reservations(later) == 0
+            assert InventoryService.get_product_by_id(product.id).quantity == 9
+            assert ReservationService.confirm(lapsed[0], user.id)['message'] == 'Reservation is already expired'
+    
+    def test_sale_reclaims_lapsed_holds(self, app):
+        """Test a purchase short of stock first returns its product's lapsed holds."""
+        with app.app_context():
+            user = UserService.create_user("testuser", "test@test.com", "1234567890", "password")
+            product = InventoryService.add_product("Test Product", 10.0, 5)
+            other = InventoryService.add_product("Other Product", 10.0, 5)
+            reservation_id = ReservationService.reserve(user.id, product.id, 5)['reservation']['id']
+            other_id = ReservationService.reserve(user.id, other.id, 5)['reservation']['id']
+            
+            for reservation in Reservation.query.all():
+                reservation.expires_at = datetime.utcnow() - timedelta(seconds=1)
+            db.session.commit()
+            
+            # Still short after reclaiming: the lapsed hold is left for the job
+            assert SalesService.create_sale(user.id, product.id, 6)['success'] is False
+            assert Reservation.query.get(reservation_id).status == 'active'
+            
+            assert SalesService.create_sale(user.id, product.id, 5)['success'] is True
+            assert Reservation.query.get(reservation_id).status == 'expired'
+            assert Reservation.query.get(other_id).status == 'active'
+
 class TestUserService:
     """Test user service methods."""
     
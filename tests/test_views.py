@@ -0,0 +1,71 @@
+"""Tests for web views."""
+import pytest
+from services import InventoryService, SalesService, UserService
+
+@pytest.fixture
+def app(app):
+    """Use small dashboard pages."""
+    app.config['DASHBOARD_PAGE_SIZE'] = 5
+    return app
+
+def test_dashboard_paginates_products(app, client):
+    """Test the dashboard renders only one page of products."""
+    first = client.get('/dashboard').get_data(as_text=True)
+    assert 'Pencil' in first
+    assert 'Notebooks' not in first
+    
+    second = client.get('/dashboard?page=2').get_data(as_text=True)
+    assert 'Notebooks' in second
+    assert 'Pencil' not in second
+
+def test_dashboard_cache_invalidated_by_writes(app, client):
+    """Test catalog writes bump the cached product table."""
+    assert '>90<' in client.get('/dashboard').get_data(as_text=True)
+    
+    with app.app_context():
+        InventoryService.update_product(1, quantity=7)
+    
+    html = client.get('/dashboard').get_data(as_text=True)
+    assert '>7<' in html
+    assert 'table-warning' in html
+    
+    # The low stock count refreshes on the cache TTL
+    app.extensions['fragment_cache'].clear()
+    assert '1 items need restocking' in client.get('/dashboard').get_data(as_text=True)
+
+def test_admin_shows_recent_sales_only(app, client):
+    """Test the admin report carries totals and at most ten sales."""
+    with app.app_context():
+        user = UserService.create_user("testuser", "test@test.com", "1234567890", "password")
+        for _ in range(12):
+            SalesService.create_sale(user.id, 1, 1)
+        
+        report = SalesService.get_sales_summary(recent=10)
+        assert report['total_transactions'] == 12
+        assert report['total_revenue'] == 24.0
+        assert len(report['recent_sales']) == 10
+        assert report['recent_sales'][-1]['id'] == 12
+    
+    assert client.get('/admin').status_code == 200
+
+def test_reservation_api(app, client):
+    """Test held stock shows as unavailable until the hold is released."""
+    result = client.post('/api/reservations', json={'product_id': 1, 'quantity': 30}).get_json()
+    assert result['success'] is True
+    reservation_id = result['reservation']['id']
+    
+    html = client.get('/dashboard').get_data(as_text=True)
+    assert '>60 <small class="text-muted">(30 held)</small><' in html
+    assert client.post('/api/purchase', json={'product_id': 1, 'quantity': 70}).get_json()['success'] is False
+    assert [r['id'] for r in client.get('/api/reservations').get_json()] == [reservation_id]
+    
+    assert client.post(f'/api/reservations/{reservation_id}/release').get_json()['success'] is True
+    assert '>90<' in client.get('/dashboard').get_data(as_text=True)
+    
+    result = client.post('/api/reservations', json={'product_id': 1, 'quantity': 30}).get_json()
+    reservation_id = result['reservation']['id']
+    assert '(30 held)' in client.get('/dashboard').get_data(as_text=True)
+    assert client.post(f'/api/reservations/{reservation_id}/confirm').get_json()['success'] is True
+    html = client.get('/dashboard').get_data(as_text=True)
+    assert '>60<' in html
+    assert 'held)' not in html